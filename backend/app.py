@@ -6,8 +6,10 @@ import os
 from flask import Flask, request
 from flask_cors import CORS
 from flask_socketio import SocketIO
+from jinja2 import FileSystemBytecodeCache
 
 from backend.config.flask_config import config
+from src.utils.json_provider import OrjsonProvider
 from backend.routes.auth import auth_bp
 from backend.routes.dashboard import dashboard_bp
 from backend.routes.locrits import locrits_bp
@@ -22,10 +24,30 @@ from backend.routes.websocket import chat_namespace
 from src.services.ui_logging_service import ui_logging_service
 from src.services.comprehensive_logging_service import comprehensive_logger
 
+try:
+    import redis
+    from flask_session import Session
+    FLASK_SESSION_AVAILABLE = True
+except ImportError:
+    FLASK_SESSION_AVAILABLE = False
+
+try:
+    from flask_compress import Compress
+    FLASK_COMPRESS_AVAILABLE = True
+except ImportError:
+    FLASK_COMPRESS_AVAILABLE = False
+
+try:
+    from gevent import monkey as gevent_monkey
+    GEVENT_AVAILABLE = True
+except ImportError:
+    GEVENT_AVAILABLE = False
+
 
 def create_app(config_name='default'):
     """Create and configure Flask application"""
     app = Flask(__name__, template_folder='../templates', static_folder='../static')
+    app.json = OrjsonProvider(app)
 
     # Load configuration
     app.config.from_object(config[config_name])
@@ -33,8 +55,27 @@ def create_app(config_name='default'):
     # Set up secret key
     app.secret_key = app.config['SECRET_KEY']
 
-    # Initialize SocketIO
-    socketio = SocketIO(cors_allowed_origins=app.config['CORS_ORIGINS'])
+    # Reuse compiled templates across workers and restarts
+    jinja_cache_dir = app.config.get('JINJA_BYTECODE_CACHE_DIR')
+    if jinja_cache_dir:
+        os.makedirs(jinja_cache_dir, exist_ok=True)
+        app.jinja_env.bytecode_cache = FileSystemBytecodeCache(jinja_cache_dir)
+
+    # Server-side sessions in Redis when configured
+    if app.config.get('SESSION_REDIS_URL'):
+        if FLASK_SESSION_AVAILABLE:
+            app.config['SESSION_TYPE'] = 'redis'
+            app.config['SESSION_REDIS'] = redis.from_url(app.config['SESSION_REDIS_URL'])
+            Session(app)
+        else:
+            ui_logging_service.logger.warning(
+                "SESSION_REDIS_URL is set but flask-session/redis are not installed, "
+                "falling back to cookie sessions"
+            )
+
+    # Initialize SocketIO (gevent only when wsgi.py patched the stdlib, threads otherwise)
+    async_mode = 'gevent' if GEVENT_AVAILABLE and gevent_monkey.is_module_patched('socket') else 'threading'
+    socketio = SocketIO(cors_allowed_origins=app.config['CORS_ORIGINS'], async_mode=async_mode)
     socketio.init_app(app)
 
     # Enable CORS for React frontend
@@ -53,6 +94,10 @@ def create_app(config_name='default'):
 
     CORS(app, **cors_config)
 
+    # Compress HTML and JSON responses (see COMPRESS_* settings)
+    if FLASK_COMPRESS_AVAILABLE:
+        Compress(app)
+
     # Initialize loggers
     logger = ui_logging_service.logger
     # Also initialize comprehensive logging for system events
@@ -3,6 +3,7 @@ Flask configuration for Locrit Web UI
 """
 
 import os
+import tempfile
 
 
 class Config:
@@ -15,6 +16,20 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
 
+    # Sessions côté serveur dans Redis (optionnel, nécessite flask-session et redis) :
+    # le cookie ne contient alors plus qu'un identifiant de session
+    SESSION_REDIS_URL = os.getenv('SESSION_REDIS_URL')
+
+    # Cache du bytecode Jinja sur disque (désactivé si vide)
+    JINJA_BYTECODE_CACHE_DIR = os.getenv('JINJA_BYTECODE_CACHE_DIR')
+
+    # Compression des pages et réponses JSON (si flask-compress est installé) ;
+    # les flux SSE restent non compressés pour être envoyés au fil de l'eau
+    COMPRESS_ALGORITHM = ['br', 'gzip']
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_MIMETYPES = ['text/html', 'text/css', 'application/javascript', 'application/json']
+    COMPRESS_STREAMS = False
+
     # Configuration CORS pour React frontend
     CORS_ORIGINS = [
         'http://localhost:5173',
@@ -44,6 +59,12 @@ class ProductionConfig(Config):
     FLASK_ENV = 'production'
     SESSION_COOKIE_SECURE = True  # HTTPS requis en production
 
+    # Templates compilés une fois : pas de vérification des fichiers à chaque rendu
+    TEMPLATES_AUTO_RELOAD = False
+    JINJA_BYTECODE_CACHE_DIR = os.getenv(
+        'JINJA_BYTECODE_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'locrit_jinja_cache')
+    )
+
 
 # Configuration par défaut
 config = {
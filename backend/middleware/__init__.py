@@ -3,5 +3,6 @@ Middleware package for Locrit Backend
 """
 
 from backend.middleware.auth import login_required
+from backend.middleware.caching import conditional_get
 
-__all__ = ['login_required']
\ No newline at end of file
+__all__ = ['login_required', 'conditional_get']
\ No newline at end of file
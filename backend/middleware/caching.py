@@ -0,0 +1,27 @@
+"""
+HTTP caching middleware for Locrit Web UI
+"""
+
+import hashlib
+from functools import wraps
+from flask import current_app, make_response, request
+
+
+def conditional_get(max_age=5):
+    """
+    Décorateur ajoutant ETag et Cache-Control aux réponses 200, pour que les
+    clients qui interrogent régulièrement une route reçoivent un 304 sans
+    corps tant que le contenu n'a pas changé
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            response = make_response(current_app.ensure_sync(f)(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(hashlib.blake2b(response.get_data(), digest_size=8).hexdigest())
+                response.cache_control.private = True
+                response.cache_control.max_age = max_age
+                response.make_conditional(request)
+            return response
+        return decorated_function
+    return decorator
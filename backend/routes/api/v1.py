@@ -2,11 +2,13 @@
 Public API v1 routes for inter-Locrit communication
 """
 
-import asyncio
 import json
 from datetime import datetime
 from flask import Blueprint, request, jsonify, Response
+from backend.middleware.caching import conditional_get
 from src.services.config_service import config_service
+from src.services.conversation_service import conversation_service
+from src.services.ollama_service import get_ollama_service_for_locrit, CONNECTION_CHECK_TTL
 from src.services.ui_logging_service import ui_logging_service
 
 api_v1_bp = Blueprint('api_v1', __name__)
@@ -37,28 +39,24 @@ def api_ping():
 
 
 @api_v1_bp.route('/api/v1/locrits', methods=['GET'])
+@conditional_get()
 def api_list_locrits():
     """API publique pour lister les Locrits disponibles"""
     try:
-        locrits = config_service.list_locrits()
-        locrits_info = []
-
-        for locrit_name in locrits:
-            settings = config_service.get_locrit_settings(locrit_name)
-            if settings and settings.get('active', False):
-                # Vérifier si le Locrit est ouvert aux autres Locrits
-                open_to_locrits = settings.get('open_to', {}).get('locrits', False)
-                if open_to_locrits:
-                    locrits_info.append({
-                        'name': locrit_name,
-                        'description': settings.get('description', ''),
-                        'model': settings.get('ollama_model', ''),
-                        'public_address': settings.get('public_address'),
-                        'capabilities': {
-                            'chat': True,
-                            'stream': True
-                        }
-                    })
+        # Locrits actifs et ouverts aux autres Locrits
+        locrits_info = [
+            {
+                'name': locrit_name,
+                'description': settings.get('description', ''),
+                'model': settings.get('ollama_model', ''),
+                'public_address': settings.get('public_address'),
+                'capabilities': {
+                    'chat': True,
+                    'stream': True
+                }
+            }
+            for locrit_name, settings in config_service.list_active_locrits_open_to('locrits')
+        ]
 
         return jsonify({
             'success': True,
@@ -130,8 +128,6 @@ async def api_v1_chat_with_locrit(locrit_name):
 
         # Si conversation_id est fourni, utiliser le service de conversation
         if conversation_id:
-            from src.services.conversation_service import conversation_service
-
             result = await conversation_service.send_message(
                 conversation_id=conversation_id,
                 message=message,
@@ -169,8 +165,6 @@ async def api_v1_chat_with_locrit(locrit_name):
         context = data.get('context', '')
 
         # Utiliser le service Ollama pour générer la réponse
-        from src.services.ollama_service import get_ollama_service_for_locrit
-
         try:
             ollama_service = get_ollama_service_for_locrit(locrit_name)
         except (ValueError, Exception) as e:
@@ -183,7 +177,7 @@ async def api_v1_chat_with_locrit(locrit_name):
             return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({'error': 'Service Ollama non disponible - connexion échouée'}), 503
 
@@ -195,15 +189,7 @@ async def api_v1_chat_with_locrit(locrit_name):
             system_prompt += f"\\n\\nContexte de la conversation: {context}"
 
         try:
-            ollama_service.current_model = model
-            ollama_service.is_connected = True
-            ollama_service.available_models = connection_test.get('models', [])
-
-            # Utiliser nest_asyncio pour permettre asyncio.run dans Flask
-            import nest_asyncio
-            nest_asyncio.apply()
-
-            response = asyncio.run(ollama_service.chat(message, system_prompt))
+            response = await ollama_service.chat(message, system_prompt, model=model)
 
             # Log de la communication inter-Locrits
             logger.info(f"Communication inter-Locrits: {sender_name} -> {locrit_name}")
@@ -3,21 +3,27 @@ Chat routes for Locrit Web UI
 """
 
 import asyncio
-import json
+import time
+import orjson
 from flask import Blueprint, render_template, request, session, flash, redirect, url_for, jsonify, Response
 from backend.middleware.auth import login_required
 from src.services.config_service import config_service
+from src.services.conversation_service import conversation_service
+from src.services.memory_manager_service import memory_manager
+from src.services.ollama_service import get_ollama_service_for_locrit, stream_chat, CONNECTION_CHECK_TTL
 from src.services.ui_logging_service import ui_logging_service
 from src.services.comprehensive_logging_service import comprehensive_logger, LogLevel, LogCategory
-from langchain_community.chat_models import ChatOllama
-from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
-from langchain_core.callbacks import StreamingStdOutCallbackHandler
+from langchain_core.messages import HumanMessage, AIMessage
 
 chat_bp = Blueprint('chat', __name__)
 
 # Logger pour l'application web
 logger = ui_logging_service.logger
 
+# Regroupement des tokens SSE: taille (caractères) ou délai (secondes) avant envoi
+SSE_FLUSH_SIZE = 512
+SSE_FLUSH_INTERVAL = 0.008
+
 
 @chat_bp.route('/locrits/<locrit_name>/chat')
 @login_required
@@ -80,8 +86,6 @@ async def api_chat_with_locrit(locrit_name):
 
         # Si conversation_id est fourni, utiliser le service de conversation
         if conversation_id:
-            from src.services.conversation_service import conversation_service
-
             result = await conversation_service.send_message(
                 conversation_id=conversation_id,
                 message=message,
@@ -149,9 +153,6 @@ async def api_chat_with_locrit(locrit_name):
             return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
 
         # Utiliser LangChain avec ChatOllama
-        from src.services.ollama_service import get_ollama_service_for_locrit
-        from src.services.memory_manager_service import memory_manager
-
         try:
             ollama_service = get_ollama_service_for_locrit(locrit_name)
         except (ValueError, Exception) as e:
@@ -159,7 +160,7 @@ async def api_chat_with_locrit(locrit_name):
             return jsonify({'error': f'Service Ollama non disponible: {str(e)}'}), 503
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({'error': 'Service Ollama non disponible - connexion échouée'}), 503
 
@@ -208,7 +209,8 @@ async def api_chat_with_locrit(locrit_name):
             response = await ollama_service.chat(
                 message=message,
                 system_prompt=system_prompt,
-                locrit_name=locrit_name
+                locrit_name=locrit_name,
+                model=model
             )
 
             # Sauvegarder la réponse dans la mémoire du Locrit
@@ -312,9 +314,6 @@ def api_chat_stream_with_locrit(locrit_name):
         if not model:
             return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
 
-        # Utiliser LangChain avec ChatOllama
-        from src.services.ollama_service import get_ollama_service_for_locrit
-
         try:
             ollama_service = get_ollama_service_for_locrit(locrit_name)
         except (ValueError, Exception) as e:
@@ -322,7 +321,7 @@ def api_chat_stream_with_locrit(locrit_name):
             return jsonify({'error': f'Service Ollama non disponible: {str(e)}'}), 503
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({'error': 'Service Ollama non disponible - connexion échouée'}), 503
 
@@ -330,39 +329,38 @@ def api_chat_stream_with_locrit(locrit_name):
         system_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
 
         def generate_stream():
-            """Générateur pour le streaming avec LangChain"""
+            """Générateur relayant la génération faite dans le pool Ollama"""
             try:
-                # Classe de callback personnalisée pour le streaming
-                class StreamingCallback:
-                    def __init__(self):
-                        self.tokens = []
-
-                    def on_llm_new_token(self, token: str, **kwargs) -> None:
-                        self.tokens.append(token)
-
-                # Initialiser ChatOllama avec LangChain
-                chat_model = ChatOllama(
-                    model=model,
-                    base_url=ollama_service.base_url,
-                    temperature=0.7
-                )
-
                 # Préparer les messages
                 messages = [
-                    SystemMessage(content=system_prompt),
-                    HumanMessage(content=message)
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": message}
                 ]
 
-                # Streamer avec LangChain
-                for chunk in chat_model.stream(messages):
-                    if chunk.content:
-                        yield f"data: {json.dumps({'chunk': chunk.content, 'done': False})}\\n\\n"
+                # Regrouper les tokens pour limiter le nombre d'écritures
+                buffer = []
+                buffered = 0
+                last_flush = time.monotonic()
+
+                for content in stream_chat(ollama_service.base_url, model, messages,
+                                           options={'temperature': 0.7}):
+                    buffer.append(content)
+                    buffered += len(content)
+                    now = time.monotonic()
+                    if buffered >= SSE_FLUSH_SIZE or now - last_flush >= SSE_FLUSH_INTERVAL:
+                        yield f"data: {orjson.dumps({'chunk': ''.join(buffer), 'done': False}).decode()}\\n\\n"
+                        buffer.clear()
+                        buffered = 0
+                        last_flush = now
+
+                if buffer:
+                    yield f"data: {orjson.dumps({'chunk': ''.join(buffer), 'done': False}).decode()}\\n\\n"
 
-                yield f"data: {json.dumps({'done': True})}\\n\\n"
+                yield f"data: {orjson.dumps({'done': True}).decode()}\\n\\n"
 
             except Exception as e:
                 logger.error(f"Erreur lors du streaming: {str(e)}")
-                yield f"data: {json.dumps({'error': str(e), 'done': True})}\\n\\n"
+                yield f"data: {orjson.dumps({'error': str(e), 'done': True}).decode()}\\n\\n"
 
         return Response(
             generate_stream(),
@@ -2,10 +2,12 @@
 Configuration routes for Locrit Web UI
 """
 
-import requests
+import httpx
 from datetime import datetime
+from urllib.parse import urlparse
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from backend.middleware.auth import login_required
+from backend.middleware.caching import conditional_get
 from src.services.config_service import config_service
 from src.services.ui_logging_service import ui_logging_service
 
@@ -14,6 +16,18 @@ config_bp = Blueprint('config', __name__)
 # Logger pour l'application web
 logger = ui_logging_service.logger
 
+# Un serveur Ollama joignable répond à /api/tags quasi instantanément
+OLLAMA_TEST_TIMEOUT = httpx.Timeout(3.0, connect=1.0)
+
+
+def _describe_ollama_error(error: httpx.HTTPError) -> str:
+    """Message utilisateur correspondant à une erreur de test de connexion Ollama"""
+    if isinstance(error, httpx.NetworkError):
+        return "Impossible de se connecter au serveur Ollama. Vérifiez que le serveur est démarré."
+    if isinstance(error, httpx.TimeoutException):
+        return "Timeout lors de la connexion au serveur Ollama."
+    return f"Erreur de requête: {str(error) or type(error).__name__}"
+
 
 @config_bp.route('/config')
 @login_required
@@ -37,7 +51,8 @@ def app_config():
 
 
 @config_bp.route('/api/ollama/models', methods=['GET', 'POST'])
-def ollama_models():
+@conditional_get()
+async def ollama_models():
     """API pour récupérer la liste des modèles Ollama disponibles"""
     try:
         # Récupérer l'URL depuis la requête ou la configuration
@@ -59,7 +74,8 @@ def ollama_models():
         logger.info(f"Récupération des modèles Ollama depuis: {api_url}")
 
         # Récupérer la liste des modèles
-        response = requests.get(api_url, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(api_url)
         response.raise_for_status()
 
         data = response.json()
@@ -81,7 +97,7 @@ def ollama_models():
             'total_models': len(models)
         })
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Erreur connexion Ollama pour récupérer modèles: {str(e)}")
         return jsonify({
             'success': False,
@@ -121,7 +137,7 @@ def ollama_status():
 
 
 @config_bp.route('/config/test-ollama', methods=['POST'])
-def test_ollama_connection():
+async def test_ollama_connection():
     """Test la connexion au serveur Ollama côté serveur"""
     try:
         # Récupérer l'URL depuis le formulaire en priorité
@@ -140,12 +156,21 @@ def test_ollama_connection():
 
         # Nettoyer l'URL et s'assurer qu'elle se termine correctement
         test_url = test_url.rstrip('/')
+        parsed = urlparse(test_url)
+        if parsed.scheme not in ('http', 'https') or not parsed.netloc:
+            return jsonify({
+                'success': False,
+                'error': 'URL Ollama invalide (attendu: http://hote:port)',
+                'tested_url': test_url
+            }), 400
+
         api_url = f"{test_url}/api/tags"
 
         logger.info(f"Test de connexion Ollama vers: {api_url}")
 
         # Test de connexion direct
-        response = requests.get(api_url, timeout=10)
+        async with httpx.AsyncClient(timeout=OLLAMA_TEST_TIMEOUT) as client:
+            response = await client.get(api_url)
         response.raise_for_status()
 
         data = response.json()
@@ -159,8 +184,8 @@ def test_ollama_connection():
             'tested_url': test_url
         })
 
-    except requests.exceptions.ConnectionError as e:
-        error_msg = f"Impossible de se connecter au serveur Ollama. Vérifiez que le serveur est démarré."
+    except httpx.HTTPError as e:
+        error_msg = _describe_ollama_error(e)
         logger.error(f"Erreur connexion Ollama: {error_msg} - {str(e)}")
         return jsonify({
             'success': False,
@@ -169,24 +194,6 @@ def test_ollama_connection():
             'tested_url': test_url
         }), 500
 
-    except requests.exceptions.Timeout as e:
-        error_msg = f"Timeout lors de la connexion au serveur Ollama."
-        logger.error(f"Timeout Ollama: {error_msg} - {str(e)}")
-        return jsonify({
-            'success': False,
-            'error': error_msg,
-            'tested_url': test_url
-        }), 500
-
-    except requests.exceptions.RequestException as e:
-        error_msg = f"Erreur de requête: {str(e)}"
-        logger.error(f"Erreur requête Ollama: {error_msg}")
-        return jsonify({
-            'success': False,
-            'error': error_msg,
-            'tested_url': test_url
-        }), 500
-
     except Exception as e:
         logger.error(f"Erreur test connexion Ollama: {str(e)}")
         return jsonify({
@@ -479,20 +486,17 @@ def toggle_locrit_edit(locrit_name):
 
         # Sauvegarder
         config_service.update_locrit_settings(locrit_name, settings)
-        success = config_service.save_config()
+        config_service.mark_dirty()
 
-        if success:
-            edit_enabled = access_to.get('logs', False) and access_to.get('full_memory', False)
-            status = "édition activée" if edit_enabled else "édition désactivée"
-            logger.info(f"Permissions d'{status} pour le Locrit: {locrit_name}")
-            return jsonify({
-                'success': True,
-                'edit_enabled': edit_enabled,
-                'access_to': access_to,
-                'message': f'Édition {status} pour le Locrit "{locrit_name}"'
-            })
-        else:
-            return jsonify({'error': 'Erreur lors de la sauvegarde'}), 500
+        edit_enabled = access_to.get('logs', False) and access_to.get('full_memory', False)
+        status = "édition activée" if edit_enabled else "édition désactivée"
+        logger.info(f"Permissions d'{status} pour le Locrit: {locrit_name}")
+        return jsonify({
+            'success': True,
+            'edit_enabled': edit_enabled,
+            'access_to': access_to,
+            'message': f'Édition {status} pour le Locrit "{locrit_name}"'
+        })
 
     except Exception as e:
         logger.error(f"Erreur lors du toggle des permissions d'édition du Locrit {locrit_name}: {str(e)}")
@@ -719,21 +723,15 @@ def toggle_locrit_api(locrit_name):
 
         # Sauvegarder
         config_service.update_locrit_settings(locrit_name, settings)
-        success = config_service.save_config()
+        config_service.mark_dirty()
 
-        if success:
-            status = "activé" if settings['active'] else "désactivé"
-            logger.info(f"Locrit {status} via API: {locrit_name}")
-            return jsonify({
-                'success': True,
-                'active': settings['active'],
-                'message': f'Locrit "{locrit_name}" {status} !'
-            })
-        else:
-            return jsonify({
-                'success': False,
-                'error': 'Erreur lors de la sauvegarde de la configuration.'
-            }), 500
+        status = "activé" if settings['active'] else "désactivé"
+        logger.info(f"Locrit {status} via API: {locrit_name}")
+        return jsonify({
+            'success': True,
+            'active': settings['active'],
+            'message': f'Locrit "{locrit_name}" {status} !'
+        })
 
     except Exception as e:
         logger.error(f"Erreur lors du toggle du Locrit {locrit_name}: {str(e)}")
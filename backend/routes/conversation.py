@@ -37,7 +37,9 @@ def create_conversation():
         "conversation_id": "uuid",
         "locrit_name": "LocritName",
         "created_at": "2025-10-03T...",
-        "session_id": "uuid"
+        "session_id": "uuid",
+        "message_count": 0,
+        "messages": []
     }
     """
     try:
@@ -66,7 +68,9 @@ def create_conversation():
             'conversation_id': conversation['conversation_id'],
             'locrit_name': conversation['locrit_name'],
             'created_at': conversation['created_at'],
-            'session_id': conversation['session_id']
+            'session_id': conversation['session_id'],
+            'message_count': conversation['message_count'],
+            'messages': []
         })
 
     except Exception as e:
@@ -81,13 +85,15 @@ def send_message(conversation_id):
 
     Request body:
     {
-        "message": "Hello, Locrit!"
+        "message": "Hello, Locrit!",
+        "previous_response_id": "uuid"  // optional, response_id of the previous turn
     }
 
     Response:
     {
         "success": true,
         "response": "Locrit's response",
+        "response_id": "uuid",
         "conversation_id": "uuid",
         "locrit_name": "LocritName",
         "timestamp": "2025-10-03T...",
@@ -107,7 +113,8 @@ def send_message(conversation_id):
         result = asyncio.run(conversation_service.send_message(
             conversation_id=conversation_id,
             message=message,
-            save_to_memory=True
+            save_to_memory=True,
+            previous_response_id=data.get('previous_response_id')
         ))
 
         if not result.get('success'):
@@ -122,6 +129,49 @@ def send_message(conversation_id):
         return jsonify({'error': str(e)}), 500
 
 
+@conversation_bp.route('/api/conversations/<conversation_id>/messages', methods=['POST'])
+def send_messages(conversation_id):
+    """
+    Send several messages in a conversation at once. The Locrit answers once,
+    after the last message.
+
+    Request body:
+    {
+        "messages": ["First message", "Second message"],
+        "previous_response_id": "uuid"  // optional, response_id of the previous turn
+    }
+
+    Response: same as /api/conversations/<conversation_id>/message
+    """
+    try:
+        data = request.get_json()
+        if not data or not isinstance(data.get('messages'), list):
+            return jsonify({'error': 'messages is required'}), 400
+
+        messages = [m.strip() for m in data['messages'] if isinstance(m, str) and m.strip()]
+        if not messages:
+            return jsonify({'error': 'messages cannot be empty'}), 400
+
+        # Send messages and get a single response (wrap async call)
+        result = asyncio.run(conversation_service.send_messages(
+            conversation_id=conversation_id,
+            messages=messages,
+            save_to_memory=True,
+            previous_response_id=data.get('previous_response_id')
+        ))
+
+        if not result.get('success'):
+            error_msg = result.get('error', 'Unknown error')
+            status_code = 404 if 'not found' in error_msg.lower() else 500
+            return jsonify(result), status_code
+
+        return jsonify(result)
+
+    except Exception as e:
+        logger.error(f"Error sending messages: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
 @conversation_bp.route('/api/conversations/<conversation_id>', methods=['GET'])
 def get_conversation(conversation_id):
     """
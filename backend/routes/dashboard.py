@@ -13,33 +13,40 @@ dashboard_bp = Blueprint('dashboard', __name__)
 logger = ui_logging_service.logger
 
 
+def _locrit_card(locrit_name, settings):
+    """Champs d'un Locrit affichés dans les listes du tableau de bord"""
+    return {
+        'name': locrit_name,
+        'description': settings.get('description', 'Aucune description'),
+        'active': settings.get('active', False),
+        'model': settings.get('ollama_model', 'Non spécifié'),
+        'public_address': settings.get('public_address', ''),
+        'created_at': settings.get('created_at', ''),
+        'updated_at': settings.get('updated_at', '')
+    }
+
+
 @dashboard_bp.route('/dashboard')
 @login_required
 def dashboard():
     """Tableau de bord principal"""
     try:
         # Récupérer les locrits locaux
-        locrits = config_service.list_locrits()
+        locrits = config_service.get_all_locrit_settings()
         locrits_data = []
+        active_count = 0
 
-        for locrit_name in locrits:
-            settings = config_service.get_locrit_settings(locrit_name)
+        for locrit_name, settings in locrits.items():
             if settings:
-                locrits_data.append({
-                    'name': locrit_name,
-                    'description': settings.get('description', 'Aucune description'),
-                    'active': settings.get('active', False),
-                    'model': settings.get('ollama_model', 'Non spécifié'),
-                    'public_address': settings.get('public_address', ''),
-                    'created_at': settings.get('created_at', ''),
-                    'updated_at': settings.get('updated_at', '')
-                })
+                card = _locrit_card(locrit_name, settings)
+                active_count += bool(card['active'])
+                locrits_data.append(card)
 
         # Statistiques
         stats = {
             'total_locrits': len(locrits_data),
-            'active_locrits': len([l for l in locrits_data if l['active']]),
-            'inactive_locrits': len([l for l in locrits_data if not l['active']])
+            'active_locrits': active_count,
+            'inactive_locrits': len(locrits_data) - active_count
         }
 
         return render_template('dashboard.html',
@@ -58,20 +65,13 @@ def dashboard():
 def locrits_list():
     """Liste détaillée des locrits locaux"""
     try:
-        locrits = config_service.list_locrits()
+        locrits = config_service.get_all_locrit_settings()
         locrits_data = []
 
-        for locrit_name in locrits:
-            settings = config_service.get_locrit_settings(locrit_name)
+        for locrit_name, settings in locrits.items():
             if settings:
                 locrits_data.append({
-                    'name': locrit_name,
-                    'description': settings.get('description', 'Aucune description'),
-                    'active': settings.get('active', False),
-                    'model': settings.get('ollama_model', 'Non spécifié'),
-                    'public_address': settings.get('public_address', ''),
-                    'created_at': settings.get('created_at', ''),
-                    'updated_at': settings.get('updated_at', ''),
+                    **_locrit_card(locrit_name, settings),
                     'open_to': settings.get('open_to', {}),
                     'access_to': settings.get('access_to', {})
                 })
@@ -5,7 +5,7 @@ Locrit management routes for Locrit Web UI
 from datetime import datetime
 from flask import Blueprint, render_template, request, redirect, url_for, flash, jsonify
 from backend.middleware.auth import login_required
-from src.services.config_service import config_service
+from src.services.config_service import config_service, OPEN_TO_BITS
 from src.services.ui_logging_service import ui_logging_service
 
 locrits_bp = Blueprint('locrits', __name__)
@@ -13,6 +13,17 @@ locrits_bp = Blueprint('locrits', __name__)
 # Logger pour l'application web
 logger = ui_logging_service.logger
 
+OPEN_TO_KEYS = tuple(OPEN_TO_BITS)
+ACCESS_TO_KEYS = ('logs', 'quick_memory', 'full_memory', 'llm_info')
+
+
+def _parse_permissions(form):
+    """Extrait les cases à cocher open_to et access_to du formulaire d'un Locrit"""
+    keys = set(form.keys())
+    open_to = {key: key in keys for key in OPEN_TO_KEYS}
+    access_to = {key: key in keys for key in ACCESS_TO_KEYS}
+    return open_to, access_to
+
 
 @locrits_bp.route('/locrits/create', methods=['GET', 'POST'])
 @login_required
@@ -45,24 +56,11 @@ def create_locrit():
                 flash(f'Un Locrit avec le nom "{name}" existe déjà.', 'error')
                 return render_template('create_locrit.html')
 
-            # Paramètres open_to
-            open_to = {
-                'humans': 'humans' in request.form,
-                'locrits': 'locrits' in request.form,
-                'invitations': 'invitations' in request.form,
-                'internet': 'internet' in request.form,
-                'platform': 'platform' in request.form
-            }
-
-            # Paramètres access_to
-            access_to = {
-                'logs': 'logs' in request.form,
-                'quick_memory': 'quick_memory' in request.form,
-                'full_memory': 'full_memory' in request.form,
-                'llm_info': 'llm_info' in request.form
-            }
+            # Paramètres open_to et access_to
+            open_to, access_to = _parse_permissions(request.form)
 
             # Créer les settings du nouveau locrit
+            now = datetime.now().isoformat()
             settings = {
                 'description': description,
                 'ollama_model': model,
@@ -70,8 +68,8 @@ def create_locrit():
                 'active': False,  # Nouveau locrit inactif par défaut
                 'open_to': open_to,
                 'access_to': access_to,
-                'created_at': datetime.now().isoformat(),
-                'updated_at': datetime.now().isoformat()
+                'created_at': now,
+                'updated_at': now
             }
 
             # Sauvegarder
@@ -119,22 +117,8 @@ def edit_locrit(locrit_name):
                 flash('Le modèle Ollama est obligatoire.', 'error')
                 return render_template('edit_locrit.html', locrit_name=locrit_name, settings=settings)
 
-            # Paramètres open_to
-            open_to = {
-                'humans': 'humans' in request.form,
-                'locrits': 'locrits' in request.form,
-                'invitations': 'invitations' in request.form,
-                'internet': 'internet' in request.form,
-                'platform': 'platform' in request.form
-            }
-
-            # Paramètres access_to
-            access_to = {
-                'logs': 'logs' in request.form,
-                'quick_memory': 'quick_memory' in request.form,
-                'full_memory': 'full_memory' in request.form,
-                'llm_info': 'llm_info' in request.form
-            }
+            # Paramètres open_to et access_to
+            open_to, access_to = _parse_permissions(request.form)
 
             # Mettre à jour les settings
             settings.update({
@@ -179,18 +163,15 @@ def toggle_locrit(locrit_name):
 
         # Sauvegarder
         config_service.update_locrit_settings(locrit_name, settings)
-        success = config_service.save_config()
-
-        if success:
-            status = "activé" if settings['active'] else "désactivé"
-            logger.info(f"Locrit {status} via web: {locrit_name}")
-            return jsonify({
-                'success': True,
-                'active': settings['active'],
-                'message': f'Locrit "{locrit_name}" {status}'
-            })
-        else:
-            return jsonify({'error': 'Erreur lors de la sauvegarde'}), 500
+        config_service.mark_dirty()
+
+        status = "activé" if settings['active'] else "désactivé"
+        logger.info(f"Locrit {status} via web: {locrit_name}")
+        return jsonify({
+            'success': True,
+            'active': settings['active'],
+            'message': f'Locrit "{locrit_name}" {status}'
+        })
 
     except Exception as e:
         logger.error(f"Erreur lors du toggle du locrit: {str(e)}")
@@ -203,10 +184,11 @@ def delete_locrit(locrit_name):
     """Supprime un locrit"""
     try:
         success = config_service.delete_locrit(locrit_name)
-        if success:
-            config_service.save_config()
+        if success and config_service.save_config():
             logger.info(f"Locrit supprimé via web: {locrit_name}")
             flash(f'Locrit "{locrit_name}" supprimé avec succès.', 'success')
+        elif success:
+            flash('Erreur lors de la sauvegarde.', 'error')
         else:
             flash(f'Erreur lors de la suppression du Locrit "{locrit_name}".', 'error')
 
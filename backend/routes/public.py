@@ -4,10 +4,11 @@ Permet aux visiteurs d'interagir avec un Locrit si celui-ci est ouvert à Intern
 """
 
 import json
-import asyncio
 from datetime import datetime
 from flask import Blueprint, request, jsonify, render_template, send_from_directory
 from src.services.config_service import config_service
+from src.services.conversation_service import conversation_service
+from src.services.ollama_service import get_ollama_service_for_locrit, CONNECTION_CHECK_TTL
 from src.services.ui_logging_service import ui_logging_service
 
 public_bp = Blueprint('public', __name__)
@@ -99,8 +100,6 @@ async def chat_with_locrit_public(locrit_name):
 
         # Si conversation_id est fourni, utiliser le service de conversation
         if conversation_id:
-            from src.services.conversation_service import conversation_service
-
             result = await conversation_service.send_message(
                 conversation_id=conversation_id,
                 message=message,
@@ -149,9 +148,6 @@ async def chat_with_locrit_public(locrit_name):
         context_message = f"[Conversation publique avec {visitor_name} via l'interface web]\n{message}"
 
         # Utiliser le service Ollama directement
-        from src.services.ollama_service import get_ollama_service_for_locrit
-        import nest_asyncio
-
         try:
             ollama_service = get_ollama_service_for_locrit(locrit_name)
         except (ValueError, Exception) as e:
@@ -170,7 +166,7 @@ async def chat_with_locrit_public(locrit_name):
             }), 400
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({
                 'success': False,
@@ -182,13 +178,7 @@ async def chat_with_locrit_public(locrit_name):
         system_prompt += f"\n\nTu es en train de communiquer avec {visitor_name}, un visiteur humain sur ton interface web publique."
 
         try:
-            ollama_service.current_model = model
-            ollama_service.is_connected = True
-            ollama_service.available_models = connection_test.get('models', [])
-
-            # Utiliser nest_asyncio pour permettre asyncio.run dans Flask
-            nest_asyncio.apply()
-            response = asyncio.run(ollama_service.chat(context_message, system_prompt, locrit_name))
+            response = await ollama_service.chat(context_message, system_prompt, locrit_name, model=model)
 
             logger.info(f"Réponse générée pour {visitor_name} par {locrit_name}")
 
@@ -272,30 +262,23 @@ def list_public_locrits():
     Liste tous les Locrits accessibles publiquement
     """
     try:
-        locrits = config_service.list_locrits()
         public_locrits = []
 
-        for locrit_name in locrits:
-            settings = config_service.get_locrit_settings(locrit_name)
-
-            if settings and settings.get('active', False):
-                # Vérifier si le Locrit est ouvert à Internet
-                open_to_internet = settings.get('open_to', {}).get('internet', False)
-
-                if open_to_internet:
-                    page_config = settings.get('public_page', {
-                        'title': f'Parlez avec {locrit_name}',
-                        'description': settings.get('description', ''),
-                        'avatar': '🤖'
-                    })
-
-                    public_locrits.append({
-                        'name': locrit_name,
-                        'description': settings.get('description', ''),
-                        'public_address': settings.get('public_address'),
-                        'avatar': page_config.get('avatar', '🤖'),
-                        'title': page_config.get('title', f'Parlez avec {locrit_name}')
-                    })
+        # Locrits actifs et ouverts à Internet
+        for locrit_name, settings in config_service.list_active_locrits_open_to('internet'):
+            page_config = settings.get('public_page', {
+                'title': f'Parlez avec {locrit_name}',
+                'description': settings.get('description', ''),
+                'avatar': '🤖'
+            })
+
+            public_locrits.append({
+                'name': locrit_name,
+                'description': settings.get('description', ''),
+                'public_address': settings.get('public_address'),
+                'avatar': page_config.get('avatar', '🤖'),
+                'title': page_config.get('title', f'Parlez avec {locrit_name}')
+            })
 
         return jsonify({
             'success': True,
@@ -10,12 +10,20 @@ from flask_socketio import Namespace, emit, join_room, leave_room
 from src.services.config_service import config_service
 from src.services.ui_logging_service import ui_logging_service
 from src.services.memory_manager_service import memory_manager
+from src.services.conversation_service import conversation_service
+from src.services.ollama_service import get_ollama_client, get_ollama_service_for_locrit, CONNECTION_CHECK_TTL
 from src.services.comprehensive_logging_service import comprehensive_logger, LogLevel, LogCategory
 
 # Logger pour l'application web
 logger = ui_logging_service.logger
 
 
+def _emit_error(payload):
+    """Emit an error event and build the matching acknowledgement payload"""
+    emit('error', payload)
+    return {'success': False, 'error': payload['message']}
+
+
 class ChatNamespace(Namespace):
     """Namespace for chat WebSocket events"""
 
@@ -96,6 +104,8 @@ class ChatNamespace(Namespace):
     def on_chat_message(self, data):
         """
         Handle sending a message to a Locrit.
+        Returns {'success', 'response' | 'error'} as the acknowledgement, so
+        clients using emit-with-ack know when the reply is complete.
         Supporte deux modes:
         1. Avec conversation_id: utilise le service de conversation (contexte géré côté serveur)
         2. Sans conversation_id mais avec session_id: mode legacy (pour compatibilité descendante)
@@ -108,17 +118,13 @@ class ChatNamespace(Namespace):
             stream = data.get('stream', False)
 
             if not locrit_name or not message:
-                emit('error', {'message': 'Locrit name and message required'})
-                return
+                return _emit_error({'message': 'Locrit name and message required'})
 
             if not conversation_id and not session_id:
-                emit('error', {'message': 'Either conversation_id or session_id is required'})
-                return
+                return _emit_error({'message': 'Either conversation_id or session_id is required'})
 
             # Si conversation_id est fourni, utiliser le service de conversation
             if conversation_id:
-                from src.services.conversation_service import conversation_service
-
                 # Use conversation service (no streaming support yet in conversation service)
                 async def send_with_conversation():
                     result = await conversation_service.send_message(
@@ -131,12 +137,11 @@ class ChatNamespace(Namespace):
                 result = asyncio.run(send_with_conversation())
 
                 if not result.get('success'):
-                    emit('error', {
+                    return _emit_error({
                         'locrit_name': locrit_name,
                         'conversation_id': conversation_id,
                         'message': result.get('error', 'Unknown error')
                     })
-                    return
 
                 # Send the complete response (no streaming with conversation service)
                 emit('chat_response', {
@@ -148,43 +153,36 @@ class ChatNamespace(Namespace):
                 })
 
                 logger.info(f"WebSocket conversation message: {conversation_id} -> {locrit_name}")
-                return
+                return {'success': True, 'response': result.get('response', '')}
 
             # Mode legacy - utiliser session_id
             # Verify Locrit exists and is active
             settings = config_service.get_locrit_settings(locrit_name)
             if not settings:
-                emit('error', {'message': 'Locrit not found'})
-                return
+                return _emit_error({'message': 'Locrit not found'})
 
 
             # Check if Locrit is open to humans (for web UI)
             open_to_humans = settings.get('open_to', {}).get('humans', False)
             if not open_to_humans:
-                emit('error', {'message': 'Locrit not accessible for humans'})
-                return
+                return _emit_error({'message': 'Locrit not accessible for humans'})
 
             # Get Ollama service
-            from src.services.ollama_service import get_ollama_service_for_locrit
-
             try:
                 ollama_service = get_ollama_service_for_locrit(locrit_name)
             except (ValueError, Exception) as e:
                 logger.error(f"Failed to get Ollama service for {locrit_name}: {e}")
-                emit('error', {'message': f'Ollama service unavailable: {str(e)}'})
-                return
+                return _emit_error({'message': f'Ollama service unavailable: {str(e)}'})
 
             # Configure model
             model = settings.get('ollama_model')
             if not model:
-                emit('error', {'message': 'No model configured for this Locrit'})
-                return
+                return _emit_error({'message': 'No model configured for this Locrit'})
 
             # Test connection
-            connection_test = ollama_service.test_connection()
+            connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
             if not connection_test.get('success'):
-                emit('error', {'message': 'Ollama service unavailable - connection failed'})
-                return
+                return _emit_error({'message': 'Ollama service unavailable - connection failed'})
 
             # Set up user ID for memory (use session_id from frontend)
             user_id = session.get('user_name', 'web_user') if 'user_name' in session else 'websocket_user'
@@ -236,9 +234,7 @@ class ChatNamespace(Namespace):
 
             # Stream the response
             try:
-                import ollama
-
-                client = ollama.Client(host=ollama_service.base_url)
+                client = get_ollama_client(ollama_service.base_url)
 
                 # Build messages with conversation context
                 messages = []
@@ -321,9 +317,12 @@ class ChatNamespace(Namespace):
                         'timestamp': datetime.now().isoformat()
                     })
 
+                # Acknowledge the message once the reply is complete
+                return {'success': True, 'response': full_response}
+
             except Exception as e:
                 logger.error(f"Error streaming chat response: {str(e)}")
-                emit('error', {
+                return _emit_error({
                     'locrit_name': locrit_name,
                     'session_id': session_id,
                     'message': f'Error generating response: {str(e)}'
@@ -331,7 +330,7 @@ class ChatNamespace(Namespace):
 
         except Exception as e:
             logger.error(f"Error in send_message: {str(e)}")
-            emit('error', {'message': str(e)})
+            return _emit_error({'message': str(e)})
 
 
 # Create the chat namespace instance
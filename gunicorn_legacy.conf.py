@@ -0,0 +1,11 @@
+"""
+Configuration gunicorn de l'ancienne interface web_app_old.py
+
+    gunicorn -c gunicorn_legacy.conf.py -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 web_app_old:app
+"""
+
+
+def post_worker_init(worker):
+    """Préchauffe les connexions Ollama de chaque worker, une fois l'application chargée"""
+    import web_app_old
+    web_app_old.start_ollama_prewarm()
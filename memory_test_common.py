@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Shared setup for the memory test scripts (test_memory_progression*.py):
+backend configuration, the HTTP session and the seeded fictive character
+"""
+
+import functools
+import os
+import requests
+from faker import Faker
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Configuration
+BASE_URL = "http://localhost:5000"
+DEFAULT_LOCRIT = "Bob Technique"
+SEP = "=" * 80
+TEST_SEED = int(os.environ.get('LOCRIT_TEST_SEED', '42'))
+
+# Shared HTTP session; payloads are pre-serialized with orjson and sent as data=
+SESSION = requests.Session()
+SESSION.headers['Content-Type'] = 'application/json'
+# Retry connection failures, throttling and gateway errors, but never read errors: the
+# Locrit may already be generating a reply for a /message POST
+SESSION.mount('http://', HTTPAdapter(
+    max_retries=Retry(
+        total=2,
+        connect=2,
+        read=0,
+        backoff_factor=0.1,
+        status_forcelist=(429, 502, 503, 504),
+        allowed_methods=frozenset(['GET', 'POST'])
+    ),
+    pool_connections=20,
+    pool_maxsize=20
+))
+
+# Initialize Faker for generating fictive character
+fake = Faker()
+Faker.seed(TEST_SEED)
+
+# Resolve the providers the character uses while the module loads rather than
+# on the first character; LOCRIT_TEST_LAZY_FAKER=1 keeps Faker's lazy loading
+if os.environ.get('LOCRIT_TEST_LAZY_FAKER') != '1':
+    for _provider in (fake.name, fake.job, fake.city, fake.color_name):
+        _provider()
+
+
+@functools.lru_cache(maxsize=1)
+def _cached_character(seed):
+    """Generate a fictive character, memoized per seed so re-runs reuse it"""
+    Faker.seed(seed)
+    return {
+        "name": fake.name(),
+        "age": fake.random_int(min=25, max=65),
+        "occupation": fake.job(),
+        "city": fake.city(),
+        "hobby": fake.random_element(["painting", "photography", "cooking", "gardening", "reading"]),
+        "pet": fake.random_element(["dog", "cat", "parrot", "fish", "hamster"]),
+        "favorite_color": fake.color_name(),
+        "personality": fake.random_element(["cheerful", "thoughtful", "energetic", "calm", "curious"])
+    }
+
+
+def format_character(character, marker=""):
+    """Format the character traits as one indented block, one trait per line"""
+    return "\n".join(
+        f"   {marker}{key.replace('_', ' ').title()}: {value}"
+        for key, value in character.items()
+    )
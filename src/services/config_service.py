@@ -3,7 +3,11 @@ Service de configuration centralisé pour Locrit
 Gère la configuration YAML, les variables d'environnement et les sauvegardes
 """
 
+import atexit
+import copy
 import os
+import tempfile
+import threading
 import yaml
 import logging
 from datetime import datetime, timezone
@@ -16,6 +20,24 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Délai (secondes) pendant lequel les écritures successives sont regroupées
+CONFIG_FLUSH_DELAY = 0.2
+# Délai (secondes) avant de retenter une sauvegarde différée qui a échoué
+CONFIG_RETRY_DELAY = 5.0
+
+# Publics auxquels un Locrit peut être ouvert (settings['open_to']), un bit chacun
+OPEN_TO_BITS = {'humans': 1, 'locrits': 2, 'invitations': 4, 'internet': 8, 'platform': 16}
+
+
+def pack_open_to(open_to: Optional[Dict[str, bool]]) -> int:
+    """Encode les publics autorisés d'un Locrit en masque de bits OPEN_TO_BITS"""
+    flags = 0
+    if open_to:
+        for key, bit in OPEN_TO_BITS.items():
+            if open_to.get(key, False):
+                flags |= bit
+    return flags
+
 
 class ConfigService:
     """Service de gestion des configurations de l'application"""
@@ -23,9 +45,19 @@ class ConfigService:
     def __init__(self, config_path: str = "config.yaml"):
         self.config_path = Path(config_path)
         self.config_data: Dict[str, Any] = {}
+        # Index des Locrits actifs (nom -> (paramètres, masque open_to)), tenu à jour à l'écriture
+        self._active_locrits: Dict[str, tuple] = {}
+        # Début du prompt système de chaque Locrit, invalidé à l'écriture de ses paramètres
+        self._base_prompts: Dict[str, str] = {}
+        # Sauvegarde différée en attente (voir mark_dirty)
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_lock = threading.Lock()
+        # Une seule écriture de config.yaml à la fois (sauvegardes immédiates et différées)
+        self._save_lock = threading.Lock()
         self.logger = logging.getLogger(__name__)
         self._setup_logging()
         self._load_config()
+        atexit.register(self.flush)
     
     def _setup_logging(self):
         """Configure le logging pour le service de configuration"""
@@ -55,6 +87,25 @@ class ConfigService:
         except Exception as e:
             print(f"Erreur lors du chargement de la configuration: {e}")
             self.config_data = {}
+        self._rebuild_locrit_index()
+
+    def _index_locrit(self, locrit_name: str, settings: Optional[Dict[str, Any]]) -> None:
+        """Met à jour l'index des Locrits actifs pour un Locrit"""
+        self._base_prompts.pop(locrit_name, None)
+        if settings and settings.get('active', False):
+            self._active_locrits[locrit_name] = (settings, pack_open_to(settings.get('open_to')))
+        else:
+            self._active_locrits.pop(locrit_name, None)
+
+    def _rebuild_locrit_index(self) -> None:
+        """Reconstruit l'index des Locrits actifs depuis la configuration"""
+        instances = self.get('locrits.instances', {}) or {}
+        self._base_prompts.clear()
+        self._active_locrits = {
+            name: (settings, pack_open_to(settings.get('open_to')))
+            for name, settings in instances.items()
+            if settings and settings.get('active', False)
+        }
     
     def _create_default_config(self) -> None:
         """Crée un fichier de configuration par défaut"""
@@ -127,6 +178,13 @@ class ConfigService:
         
         # Définit la valeur finale
         config[keys[-1]] = value
+
+        # Garder l'index des Locrits actifs synchronisé
+        if keys[0] == 'locrits':
+            if len(keys) == 3 and keys[1] == 'instances':
+                self._index_locrit(keys[2], value)
+            elif len(keys) <= 2:
+                self._rebuild_locrit_index()
     
     def save_config(self) -> bool:
         """Sauvegarde la configuration dans le fichier YAML"""
@@ -301,19 +359,74 @@ class ConfigService:
         self.logger.debug(f"📖 Lecture Locrit: {locrit_name}")
         return settings
     
+    def get_locrit_base_prompt(self, locrit_name: str, settings: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Récupère les paramètres d'un Locrit (sauf s'ils sont fournis) avec le début
+        de son prompt système, construit une seule fois jusqu'à la prochaine
+        modification du Locrit. Retourne (None, None) si le Locrit n'existe pas
+        """
+        if settings is None:
+            settings = self.get_locrit_settings(locrit_name)
+        if settings is None:
+            return None, None
+
+        base_prompt = self._base_prompts.get(locrit_name)
+        if base_prompt is None:
+            base_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
+            self._base_prompts[locrit_name] = base_prompt
+        return settings, base_prompt
+
     def list_locrits(self) -> list[str]:
         """Liste tous les Locrits configurés"""
         instances = self.get('locrits.instances', {})
         locrit_names = list(instances.keys())
         self.logger.info(f"📋 Locrits locaux trouvés: {len(locrit_names)} - {locrit_names}")
         return locrit_names
+
+    def get_all_locrit_settings(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Récupère les paramètres de tous les Locrits en une seule lecture,
+        pour les pages qui listent les Locrits
+        """
+        instances = self.get('locrits.instances', {}) or {}
+        self.logger.debug(f"📖 Lecture de {len(instances)} Locrits")
+        return dict(instances)
+
+    def list_active_locrits(self) -> List[tuple]:
+        """
+        Liste les Locrits actifs sous forme de paires (nom, paramètres),
+        depuis l'index sans parcourir tous les Locrits
+        """
+        return [(name, settings) for name, (settings, _) in list(self._active_locrits.items())]
+
+    def list_active_locrits_open_to(self, audience: str) -> List[tuple]:
+        """
+        Liste les Locrits actifs ouverts à un public donné
+        (ex: 'locrits', 'internet'), sous forme de paires (nom, paramètres)
+        """
+        bit = OPEN_TO_BITS.get(audience, 0)
+        return [
+            (name, settings) for name, (settings, flags) in list(self._active_locrits.items())
+            if flags & bit
+        ]
     
+    def get_active_locrit_open_to(self, locrit_name: str, audience: str) -> Optional[Dict[str, Any]]:
+        """
+        Retourne les paramètres d'un Locrit s'il est actif et ouvert au public
+        donné (ex: 'locrits'), sinon None, par une seule lecture de l'index
+        """
+        entry = self._active_locrits.get(locrit_name)
+        if entry and entry[1] & OPEN_TO_BITS.get(audience, 0):
+            return entry[0]
+        return None
+
     def delete_locrit(self, locrit_name: str) -> bool:
         """Supprime un Locrit de la configuration"""
         instances = self.get('locrits.instances', {})
         if locrit_name in instances:
             del instances[locrit_name]
-            self.set('locrits.instances', instances)
+            self._active_locrits.pop(locrit_name, None)
+            self._base_prompts.pop(locrit_name, None)
             self.logger.info(f"🗑️ Locrit supprimé: {locrit_name}")
             return True
         else:
@@ -321,10 +434,24 @@ class ConfigService:
             return False
 
     def save_config(self) -> bool:
-        """Sauvegarde la configuration avec logs détaillés"""
+        """
+        Sauvegarde la configuration avec logs détaillés.
+        Un instantané de la configuration est écrit dans un fichier temporaire
+        puis renommé, pour ne jamais laisser de config.yaml tronqué
+        """
         try:
-            with open(self.config_path, 'w', encoding='utf-8') as file:
-                yaml.safe_dump(self.config_data, file, default_flow_style=False, allow_unicode=True)
+            with self._save_lock:
+                snapshot = copy.deepcopy(self.config_data)
+                fd, tmp_path = tempfile.mkstemp(dir=self.config_path.parent or '.', prefix='.config-', suffix='.yaml')
+                try:
+                    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+                        yaml.safe_dump(snapshot, file, default_flow_style=False, allow_unicode=True)
+                    # mkstemp crée le fichier en 0600 : garder les droits du fichier existant
+                    os.chmod(tmp_path, self.config_path.stat().st_mode & 0o777 if self.config_path.exists() else 0o644)
+                    os.replace(tmp_path, self.config_path)
+                except BaseException:
+                    os.unlink(tmp_path)
+                    raise
             
             self.logger.info(f"💾 Configuration sauvegardée: {self.config_path}")
             
@@ -337,6 +464,38 @@ class ConfigService:
             self.logger.error(f"❌ Erreur lors de la sauvegarde: {e}")
             return False
 
+    def mark_dirty(self, delay: float = CONFIG_FLUSH_DELAY) -> None:
+        """
+        Programme une sauvegarde différée de la configuration.
+        Les modifications rapprochées (ex: plusieurs toggles) sont regroupées
+        en une seule écriture du fichier; save_config() reste disponible
+        pour une sauvegarde immédiate dont le résultat doit être signalé.
+        """
+        with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+            self._flush_timer = threading.Timer(delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self) -> bool:
+        """
+        Écrit immédiatement la sauvegarde en attente, s'il y en a une, ou attend
+        la fin d'une sauvegarde différée en cours. Une sauvegarde en échec est
+        reprogrammée après CONFIG_RETRY_DELAY
+        """
+        with self._flush_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is None:
+            with self._save_lock:
+                return True
+        timer.cancel()
+        if self.save_config():
+            return True
+        self.logger.warning(f"⚠️ Sauvegarde différée reprogrammée dans {CONFIG_RETRY_DELAY}s")
+        self.mark_dirty(CONFIG_RETRY_DELAY)
+        return False
+
     def _get_current_timestamp(self) -> str:
         """Retourne le timestamp actuel au format ISO avec timezone"""
         return datetime.now(timezone.utc).isoformat()
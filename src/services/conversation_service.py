@@ -8,6 +8,7 @@ enabling the backend to track conversations independently of the UI.
 """
 
 import uuid
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, Optional, Any, List
 from .memory_manager_service import memory_manager
@@ -15,6 +16,9 @@ from .config_service import config_service
 from .comprehensive_logging_service import comprehensive_logger
 from .conversation_persistence_service import conversation_persistence
 
+# Maximum number of cached histories for chained turns (least recently used go first)
+RESPONSE_CONTEXT_CACHE_SIZE = 256
+
 
 class ConversationService:
     """Manages conversations with context stored server-side and persisted to disk."""
@@ -24,6 +28,8 @@ class ConversationService:
         # In-memory cache (loaded from disk on demand)
         self.conversations: Dict[str, Dict[str, Any]] = {}
         self._cache_loaded = False
+        # Last prompt history per conversation, keyed by the response_id it produced
+        self._response_contexts: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
 
     async def create_conversation(
         self,
@@ -103,7 +109,8 @@ class ConversationService:
         self,
         conversation_id: str,
         message: str,
-        save_to_memory: bool = True
+        save_to_memory: bool = True,
+        previous_response_id: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Send a message in a conversation and get the Locrit's response.
@@ -113,6 +120,36 @@ class ConversationService:
             conversation_id: The conversation identifier
             message: The user's message
             save_to_memory: Whether to save messages to memory
+            previous_response_id: response_id of the previous turn; when it matches
+                the cached context, history is not reloaded from memory
+
+        Returns:
+            Dictionary with response and conversation info
+        """
+        return await self.send_messages(
+            conversation_id,
+            [message],
+            save_to_memory=save_to_memory,
+            previous_response_id=previous_response_id
+        )
+
+    async def send_messages(
+        self,
+        conversation_id: str,
+        messages: List[str],
+        save_to_memory: bool = True,
+        previous_response_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Send several user messages in a conversation and get a single Locrit
+        response generated after the last one.
+
+        Args:
+            conversation_id: The conversation identifier
+            messages: The user's messages, in order
+            save_to_memory: Whether to save messages to memory
+            previous_response_id: response_id of the previous turn; when it matches
+                the cached context, history is not reloaded from memory
 
         Returns:
             Dictionary with response and conversation info
@@ -139,28 +176,48 @@ class ConversationService:
         if not model:
             return {"error": "No model configured for this Locrit", "success": False}
 
-        # Save user message to memory
+        # Reuse the cached history when the client chains on the previous response
+        # and nothing was written to this Locrit's memory since it was cached; it
+        # then matches what memory would return: the last 20 messages, including
+        # the new user messages only when they are saved. Otherwise read memory.
+        memory_revision = memory_manager.get_message_revision(locrit_name)
+        cached_context = self._response_contexts.get(conversation_id)
+        use_cached_context = bool(previous_response_id and cached_context
+                                  and cached_context["response_id"] == previous_response_id
+                                  and cached_context["memory_revision"] == memory_revision)
+        # Revision expected once this turn's own messages are saved
+        expected_revision = memory_revision + (len(messages) + 1 if save_to_memory else 0)
+
+        # Save user messages to memory
         if save_to_memory:
-            await memory_manager.save_message(
+            for message in messages:
+                await memory_manager.save_message(
+                    locrit_name=locrit_name,
+                    role="user",
+                    content=message,
+                    session_id=session_id,
+                    user_id=user_id
+                )
+
+        if use_cached_context:
+            self._response_contexts.move_to_end(conversation_id)
+            conversation_history = cached_context["history"]
+            if save_to_memory:
+                conversation_history = (conversation_history + [
+                    {"role": "user", "content": message} for message in messages
+                ])[-20:]
+        else:
+            conversation_history = await memory_manager.get_conversation_history(
                 locrit_name=locrit_name,
-                role="user",
-                content=message,
                 session_id=session_id,
-                user_id=user_id
+                limit=20
             )
 
-        # Get conversation history from memory (last 20 messages)
-        conversation_history = await memory_manager.get_conversation_history(
-            locrit_name=locrit_name,
-            session_id=session_id,
-            limit=20
-        )
-
         # Prepare system prompt
         system_prompt = f"Tu es {locrit_name}, un Locrit. {locrit_settings.get('description', '')}"
 
         # Generate response using Ollama
-        from src.services.ollama_service import get_ollama_service_for_locrit
+        from src.services.ollama_service import get_ollama_service_for_locrit, CONNECTION_CHECK_TTL
 
         try:
             ollama_service = get_ollama_service_for_locrit(locrit_name)
@@ -168,20 +225,11 @@ class ConversationService:
             return {"error": f"Ollama service not available: {str(e)}", "success": False}
 
         # Test connection
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return {"error": "Ollama service not available - connection failed", "success": False}
 
         try:
-            # Set model
-            ollama_service.current_model = model
-            ollama_service.is_connected = True
-
-            # Generate response with conversation history context
-            import nest_asyncio
-            import asyncio
-            nest_asyncio.apply()
-
             # Build context from history
             context_messages = []
             for msg in conversation_history:
@@ -189,13 +237,14 @@ class ConversationService:
                 content = msg.get('content', '')
                 context_messages.append(f"{role}: {content}")
 
-            # Add current message
-            context_messages.append(f"user: {message}")
+            # Add current messages
+            context_messages.extend(f"user: {message}" for message in messages)
 
             # Create full prompt with context
             full_message = "\n".join(context_messages[-10:])  # Last 10 exchanges
 
-            response = asyncio.run(ollama_service.chat(full_message, system_prompt))
+            # Generate response with conversation history context
+            response = await ollama_service.chat(full_message, system_prompt, model=model)
 
             # Save assistant response to memory
             if save_to_memory:
@@ -207,9 +256,26 @@ class ConversationService:
                     user_id=user_id
                 )
 
+            # Cache the history memory now holds for the next chained turn, unless
+            # a save failed or another writer touched this Locrit's memory meanwhile
+            response_id = str(uuid.uuid4())
+            if save_to_memory:
+                conversation_history = (conversation_history + [{"role": "assistant", "content": response}])[-20:]
+            if memory_manager.get_message_revision(locrit_name) == expected_revision:
+                self._response_contexts[conversation_id] = {
+                    "response_id": response_id,
+                    "memory_revision": expected_revision,
+                    "history": conversation_history
+                }
+                self._response_contexts.move_to_end(conversation_id)
+                if len(self._response_contexts) > RESPONSE_CONTEXT_CACHE_SIZE:
+                    self._response_contexts.popitem(last=False)
+            else:
+                self._response_contexts.pop(conversation_id, None)
+
             # Update conversation metadata
             conversation["last_activity"] = datetime.now().isoformat()
-            conversation["message_count"] += 2  # User message + assistant response
+            conversation["message_count"] += len(messages) + 1  # User messages + assistant response
 
             # PERSIST UPDATES TO DISK for autonomous tracking
             await conversation_persistence.update_conversation(
@@ -223,6 +289,7 @@ class ConversationService:
             return {
                 "success": True,
                 "response": response,
+                "response_id": response_id,
                 "conversation_id": conversation_id,
                 "locrit_name": locrit_name,
                 "model": model,
@@ -310,6 +377,7 @@ class ConversationService:
         # Remove from cache
         if conversation_id in self.conversations:
             del self.conversations[conversation_id]
+        self._response_contexts.pop(conversation_id, None)
 
         # Mark as deleted on disk (preserves history)
         return await conversation_persistence.delete_conversation(conversation_id)
@@ -26,6 +26,26 @@ class MemoryManagerService:
         self.is_initialized = False
         self._initialization_locks: Dict[str, asyncio.Lock] = {}
         self._global_lock = asyncio.Lock()
+        # Incremented whenever stored messages of a Locrit are saved, edited or removed
+        self._message_revisions: Dict[str, int] = {}
+
+    def get_message_revision(self, locrit_name: str) -> int:
+        """
+        Get the revision of a Locrit's stored messages. It changes each time
+        messages are saved, edited, deleted or cleared, so callers caching a
+        conversation history can tell when it no longer matches memory.
+
+        Args:
+            locrit_name: Name of the Locrit
+
+        Returns:
+            Current revision number
+        """
+        return self._message_revisions.get(locrit_name, 0)
+
+    def _bump_message_revision(self, locrit_name: str) -> None:
+        """Mark the stored messages of a Locrit as modified."""
+        self._message_revisions[locrit_name] = self._message_revisions.get(locrit_name, 0) + 1
 
     async def initialize(self) -> bool:
         """
@@ -142,6 +162,7 @@ class MemoryManagerService:
                 metadata=metadata
             )
 
+            self._bump_message_revision(locrit_name)
             return result
         except Exception as e:
             print(f"Error saving message for {locrit_name}: {e}")
@@ -408,6 +429,7 @@ class MemoryManagerService:
         Returns:
             True if deletion succeeds
         """
+        self._bump_message_revision(locrit_name)
         memory_service = await self.get_memory_service(locrit_name)
         if not memory_service:
             return False
@@ -464,6 +486,7 @@ class MemoryManagerService:
         Returns:
             True if edit succeeds
         """
+        self._bump_message_revision(locrit_name)
         memory_service = await self.get_memory_service(locrit_name)
         if not memory_service:
             return False
@@ -576,6 +599,7 @@ class MemoryManagerService:
         Returns:
             True if deletion succeeds
         """
+        self._bump_message_revision(locrit_name)
         memory_service = await self.get_memory_service(locrit_name)
         if not memory_service:
             return False
@@ -596,6 +620,7 @@ class MemoryManagerService:
         Returns:
             True if clearing succeeds
         """
+        self._bump_message_revision(locrit_name)
         memory_service = await self.get_memory_service(locrit_name)
         if not memory_service:
             return False
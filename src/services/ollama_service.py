@@ -3,11 +3,158 @@ Service de connexion et communication avec Ollama.
 """
 
 import asyncio
-from typing import Optional, Dict, Any, AsyncGenerator
+import os
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, AsyncGenerator, Iterator
+import httpx
 import ollama
+import orjson
+import requests
 from ollama import AsyncClient
+from requests.adapters import HTTPAdapter
 from .comprehensive_logging_service import comprehensive_logger, LogLevel, LogCategory
 
+# Clients synchrones partagés par serveur Ollama, pour réutiliser les connexions
+# d'une requête à l'autre au lieu d'en ouvrir de nouvelles à chaque chat
+_ollama_clients: Dict[str, ollama.Client] = {}
+_ollama_clients_lock = threading.Lock()
+# Une génération peut durer plusieurs minutes ; la connexion, elle, doit être rapide
+OLLAMA_CLIENT_TIMEOUT = httpx.Timeout(300.0, connect=10.0)
+OLLAMA_CLIENT_LIMITS = httpx.Limits(max_keepalive_connections=40, max_connections=100, keepalive_expiry=30.0)
+
+# Session HTTP partagée pour les tests de connexion
+_http_session = requests.Session()
+_http_session.mount('http://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+_http_session.mount('https://', HTTPAdapter(pool_connections=16, pool_maxsize=32))
+
+
+# Pool dédié à la génération en streaming : le nombre de générations Ollama
+# simultanées est borné indépendamment du nombre de connexions web
+_stream_executor = ThreadPoolExecutor(
+    max_workers=int(os.getenv('OLLAMA_STREAM_WORKERS', '4')),
+    thread_name_prefix='ollama-stream'
+)
+_STREAM_END = object()
+# (connexion, délai max entre deux lignes) pour /api/chat en streaming : mêmes
+# délais que les clients Ollama, le chargement d'un modèle pouvant retarder le
+# premier token de plusieurs minutes
+OLLAMA_STREAM_TIMEOUT = (OLLAMA_CLIENT_TIMEOUT.connect, OLLAMA_CLIENT_TIMEOUT.read)
+# Attente maximale d'un worker libre du pool avant de répondre "occupé"
+OLLAMA_STREAM_QUEUE_TIMEOUT = float(os.getenv('OLLAMA_STREAM_QUEUE_TIMEOUT', '30'))
+# Morceaux en attente du client ; au-delà, la génération attend que le client lise
+OLLAMA_STREAM_BUFFER = 256
+
+# Dernier test de connexion réussi par serveur (time.monotonic()), pour ne pas
+# refaire un aller-retour /api/tags avant chaque message
+_last_ok_at: Dict[str, float] = {}
+CONNECTION_CHECK_TTL = 30
+
+
+def get_ollama_client(base_url: str) -> ollama.Client:
+    """
+    Retourne le client Ollama synchrone partagé pour un serveur.
+
+    Args:
+        base_url: URL du serveur Ollama
+
+    Returns:
+        Client réutilisé pour toutes les requêtes vers ce serveur
+    """
+    host = base_url.rstrip('/')
+    client = _ollama_clients.get(host)
+    if client is None:
+        with _ollama_clients_lock:
+            client = _ollama_clients.get(host)
+            if client is None:
+                client = _ollama_clients[host] = ollama.Client(
+                    host=host, timeout=OLLAMA_CLIENT_TIMEOUT, limits=OLLAMA_CLIENT_LIMITS
+                )
+    return client
+
+
+def stream_chat(base_url: str, model: str, messages: list, **kwargs) -> Iterator[str]:
+    """
+    Génère une réponse dans le pool de génération et relaie ses morceaux.
+    Le flux JSON-lines de /api/chat est lu directement : seul le texte de
+    chaque ligne est extrait, sans construire les objets réponse du SDK.
+
+    Args:
+        base_url: URL du serveur Ollama
+        model: Modèle à utiliser
+        messages: Messages au format Ollama
+        **kwargs: Champs supplémentaires de la requête /api/chat (ex: options)
+
+    Yields:
+        Morceaux de texte au fur et à mesure de la génération
+
+    Raises:
+        TimeoutError: Aucun worker libre dans le pool, ou Ollama ne répond plus
+        Exception: L'erreur rencontrée pendant la génération
+    """
+    chunks = queue.Queue(maxsize=OLLAMA_STREAM_BUFFER)
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    def put(item) -> bool:
+        # File bornée : attendre que le client lise, sauf s'il est parti
+        while not cancelled.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        if cancelled.is_set():
+            return
+        started.set()
+        try:
+            payload = {'model': model, 'messages': messages, 'stream': True, **kwargs}
+            with _http_session.post(f"{base_url.rstrip('/')}/api/chat", json=payload,
+                                    stream=True, timeout=OLLAMA_STREAM_TIMEOUT) as response:
+                response.raise_for_status()
+                for line in response.iter_lines():
+                    if cancelled.is_set():
+                        break
+                    if not line:
+                        continue
+                    chunk = orjson.loads(line)
+                    if 'error' in chunk:
+                        raise Exception(chunk['error'])
+                    content = chunk.get('message', {}).get('content')
+                    if content and not put(content):
+                        break
+        except Exception as e:
+            put(e)
+        finally:
+            put(_STREAM_END)
+
+    future = _stream_executor.submit(produce)
+    # Le premier morceau peut attendre la connexion puis le chargement du modèle
+    idle_timeout = sum(OLLAMA_STREAM_TIMEOUT)
+    try:
+        if not started.wait(OLLAMA_STREAM_QUEUE_TIMEOUT):
+            raise TimeoutError("Serveur occupé : toutes les générations Ollama sont en cours, réessayez plus tard")
+        while True:
+            try:
+                item = chunks.get(timeout=idle_timeout)
+            except queue.Empty:
+                raise TimeoutError(f"Ollama n'a rien renvoyé depuis {idle_timeout:.0f} s")
+            if item is _STREAM_END:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        # Le client est parti : retirer la génération de la file d'attente,
+        # ou l'arrêter au prochain morceau si elle a déjà commencé
+        cancelled.set()
+        future.cancel()
+
 
 class OllamaService:
     """Service pour gérer la connexion et communication avec Ollama."""
@@ -96,13 +243,16 @@ class OllamaService:
             "available_models": self.available_models
         }
     
-    async def chat(self, message: str, system_prompt: Optional[str] = None, locrit_name: Optional[str] = None) -> str:
+    async def chat(self, message: str, system_prompt: Optional[str] = None, locrit_name: Optional[str] = None,
+                   model: Optional[str] = None) -> str:
         """
         Envoie un message au modèle et retourne la réponse.
         
         Args:
             message: Message de l'utilisateur
             system_prompt: Prompt système optionnel
+            model: Modèle à utiliser pour cet appel, sans modifier le modèle
+                sélectionné ; l'appelant a alors déjà vérifié la connexion
             
         Returns:
             Réponse du modèle
@@ -110,11 +260,13 @@ class OllamaService:
         Raises:
             Exception: Si pas de connexion ou modèle sélectionné
         """
-        if not self.is_connected:
-            raise Exception("Pas de connexion à Ollama")
-        
-        if not self.current_model:
-            raise Exception("Aucun modèle sélectionné")
+        if not model:
+            if not self.is_connected:
+                raise Exception("Pas de connexion à Ollama")
+
+            if not self.current_model:
+                raise Exception("Aucun modèle sélectionné")
+            model = self.current_model
         
         messages = []
         if system_prompt:
@@ -127,14 +279,14 @@ class OllamaService:
 
             # Log the request
             comprehensive_logger.log_ollama_request(
-                model=self.current_model,
+                model=model,
                 messages=messages,
                 locrit_name=locrit_name or "system",
                 stream=False
             )
 
             response = await self.client.chat(
-                model=self.current_model,
+                model=model,
                 messages=messages
             )
 
@@ -143,7 +295,7 @@ class OllamaService:
 
             # Log the response
             comprehensive_logger.log_ollama_response(
-                model=self.current_model,
+                model=model,
                 response=response['message']['content'],
                 locrit_name=locrit_name or "system",
                 duration_ms=duration_ms
@@ -155,7 +307,7 @@ class OllamaService:
             if 'operation_id' in locals():
                 duration_ms = comprehensive_logger.end_operation(operation_id)
                 comprehensive_logger.log_ollama_response(
-                    model=self.current_model,
+                    model=model,
                     response="",
                     locrit_name=locrit_name or "system",
                     duration_ms=duration_ms,
@@ -265,22 +417,33 @@ class OllamaService:
             print(f"Erreur lors du téléchargement du modèle : {e}")
             return False
 
-    def test_connection(self) -> Dict[str, Any]:
+    def test_connection(self, max_age: float = 0) -> Dict[str, Any]:
         """
         Test synchrone de la connexion Ollama pour l'interface web.
 
+        Args:
+            max_age: Si un test a réussi il y a moins de max_age secondes,
+                     le réutiliser sans interroger le serveur (la liste des
+                     modèles n'est alors pas incluse)
+
         Returns:
             Dictionnaire avec le statut de la connexion et les modèles
         """
-        try:
-            # Utiliser le client synchrone pour un test rapide
-            import requests
+        if max_age and time.monotonic() - _last_ok_at.get(self.base_url, 0) < max_age:
+            return {
+                'success': True,
+                'cached': True,
+                'base_url': self.base_url
+            }
 
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+        try:
+            # Utiliser la session partagée pour un test rapide
+            response = _http_session.get(f"{self.base_url}/api/tags", timeout=5)
             response.raise_for_status()
 
             data = response.json()
             models = [model['name'] for model in data.get('models', [])]
+            _last_ok_at[self.base_url] = time.monotonic()
 
             return {
                 'success': True,
@@ -289,6 +452,7 @@ class OllamaService:
             }
 
         except requests.exceptions.RequestException as e:
+            _last_ok_at.pop(self.base_url, None)
             return {
                 'success': False,
                 'error': f'Erreur de connexion: {str(e)}',
@@ -301,6 +465,10 @@ class OllamaService:
                 'base_url': self.base_url
             }
 
+    def forget_connection_check(self) -> None:
+        """Oublie le dernier test réussi : le prochain test interrogera le serveur"""
+        _last_ok_at.pop(self.base_url, None)
+
 
 def get_ollama_service_for_locrit(locrit_name: str) -> Optional[OllamaService]:
     """
@@ -467,5 +467,34 @@ class TestConfigServiceIntegration:
         assert 'integration_locrit' not in new_service.list_locrits()
 
 
+class TestConfigServiceDeferredSave:
+    """Test cases for the deferred config.yaml save (mark_dirty / flush)"""
+
+    @pytest.fixture
+    def yaml_service(self, tmp_path):
+        """Create a ConfigService backed by a temporary config.yaml"""
+        return ConfigService(config_path=str(tmp_path / 'config.yaml'))
+
+    def test_flush_writes_pending_save(self, yaml_service):
+        """Test that flush() writes a pending deferred save atomically"""
+        yaml_service.set('ui.theme', 'light')
+        yaml_service.mark_dirty(delay=60)
+
+        assert yaml_service.flush() is True
+        assert 'theme: light' in yaml_service.config_path.read_text(encoding='utf-8')
+        assert list(yaml_service.config_path.parent.glob('.config-*')) == []
+
+    def test_failed_flush_is_rescheduled(self, yaml_service):
+        """Test that a failed deferred save is re-armed instead of dropped"""
+        yaml_service.mark_dirty(delay=60)
+
+        with patch.object(yaml_service, 'save_config', return_value=False):
+            assert yaml_service.flush() is False
+
+        assert yaml_service._flush_timer is not None
+        assert yaml_service.flush() is True
+        assert yaml_service._flush_timer is None
+
+
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
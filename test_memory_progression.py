@@ -12,54 +12,123 @@ Test Flow:
 5. Memory recall - Ask Locrit to recall all character information
 """
 
+import os
+import orjson
 import requests
-import json
+import socket
 import sys
+import threading
 import time
-from faker import Faker
+from pathlib import Path
+from urllib.parse import urlsplit
+from memory_test_common import (
+    BASE_URL, DEFAULT_LOCRIT, SEP, TEST_SEED, SESSION, _cached_character, format_character
+)
 
-# Configuration
-BASE_URL = "http://localhost:5000"
-DEFAULT_LOCRIT = "Bob Technique"
+# Optional delay (seconds) between turns, only useful when debugging manually
+TEST_PACING = float(os.environ.get('LOCRIT_TEST_PACING', '0'))
+# Seconds to wait for the backend to answer a turn before it is abandoned
+TEST_IDLE_TIMEOUT = float(os.environ.get('LOCRIT_TEST_IDLE_TIMEOUT', '30'))
+
+# Last conversation, reused by --resume so the backend keeps its warm context
+STATE_PATH = Path.home() / '.locrit_test_state.json'
+STATE_TTL = 3600  # seconds
+
+# Caps the turns in flight when several MemoryTest instances run concurrently
+# (e.g. a multi-character soak test), keeping the backend below its pool size
+_TURN_SEMAPHORE = threading.BoundedSemaphore(int(os.environ.get('LOCRIT_TEST_CONCURRENCY', '8')))
+
+
+def build_questions(character):
+    """Build the specific recall questions about a character, in asking order"""
+    name = character['name']
+    return (
+        f"What is {name}'s occupation?",
+        f"Where does {name} live?",
+        f"What hobby does {name} enjoy?",
+        f"What pet does {name} have?",
+    )
 
-# Initialize Faker for generating fictive character
-fake = Faker()
 
 class MemoryTest:
     """Test class for Locrit memory functionality"""
 
-    def __init__(self, locrit_name=DEFAULT_LOCRIT):
+    def __init__(self, locrit_name=DEFAULT_LOCRIT, resume=False):
         self.locrit_name = locrit_name
+        self.resume = resume
         self.conversation_id = None
+        self._last_response_id = None
         self.character = self._generate_character()
 
     def _generate_character(self):
         """Generate a fictive character with multiple traits"""
-        return {
-            "name": fake.name(),
-            "age": fake.random_int(min=25, max=65),
-            "occupation": fake.job(),
-            "city": fake.city(),
-            "hobby": fake.random_element(["painting", "photography", "cooking", "gardening", "reading"]),
-            "pet": fake.random_element(["dog", "cat", "parrot", "fish", "hamster"]),
-            "favorite_color": fake.color_name(),
-            "personality": fake.random_element(["cheerful", "thoughtful", "energetic", "calm", "curious"])
+        return dict(_cached_character(TEST_SEED))
+
+    def _load_state(self):
+        """Return the saved conversation_id if it is recent and for this Locrit"""
+        try:
+            state = orjson.loads(STATE_PATH.read_bytes())
+        except (OSError, orjson.JSONDecodeError):
+            return None
+
+        if not isinstance(state, dict):
+            return None
+        if state.get('locrit_name') != self.locrit_name:
+            return None
+        if time.time() - state.get('saved_at', 0) > STATE_TTL:
+            return None
+        return state.get('conversation_id')
+
+    def save_state(self):
+        """Save the conversation_id so the next run can --resume it"""
+        state = {
+            'conversation_id': self.conversation_id,
+            'locrit_name': self.locrit_name,
+            'saved_at': time.time()
         }
+        try:
+            STATE_PATH.write_bytes(orjson.dumps(state))
+        except OSError as e:
+            print(f"⚠️  Could not save test state: {e}")
+
+    def _conversation_exists(self, conversation_id):
+        """Check that the backend still holds a conversation (lost on restart)"""
+        try:
+            response = SESSION.get(
+                f"{BASE_URL}/api/conversations/{conversation_id}",
+                params={"limit": 1},
+                timeout=10
+            )
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 200
 
     def create_conversation(self):
-        """Create a new conversation with the Locrit"""
+        """Create a new conversation with the Locrit, or resume the last one"""
+        if self.resume:
+            conversation_id = self._load_state()
+            if conversation_id and self._conversation_exists(conversation_id):
+                self.conversation_id = conversation_id
+                print(f"\n♻️  Resuming conversation with {self.locrit_name}: {conversation_id}")
+                return True
+            if conversation_id:
+                print(f"\n⚠️  Backend no longer knows conversation {conversation_id}, creating a new one")
+            else:
+                print("\n⚠️  No recent conversation to resume, creating a new one")
+
         print(f"\n🔧 Creating conversation with {self.locrit_name}...")
 
-        response = requests.post(
+        payload = {
+            "locrit_name": self.locrit_name,
+            "user_id": "memory_test_user",
+            "metadata": {
+                "test_type": "memory_progression",
+                "character_name": self.character["name"]
+            }
+        }
+        response = SESSION.post(
             f"{BASE_URL}/api/conversations/create",
-            json={
-                "locrit_name": self.locrit_name,
-                "user_id": "memory_test_user",
-                "metadata": {
-                    "test_type": "memory_progression",
-                    "character_name": self.character["name"]
-                }
-            },
+            data=orjson.dumps(payload),
             timeout=10
         )
 
@@ -67,39 +136,59 @@ class MemoryTest:
             print(f"❌ Failed to create conversation: {response.text}")
             return False
 
-        data = response.json()
+        data = orjson.loads(response.content)
         self.conversation_id = data.get('conversation_id')
         print(f"✅ Conversation created: {self.conversation_id}")
         return True
 
     def send_message(self, message):
         """Send a message in the conversation"""
+        return self._post_turn("message", {"message": message})
+
+    def send_messages_batch(self, messages):
+        """Send several messages at once, the Locrit answers after the last one"""
+        return self._post_turn("messages", {"messages": messages})
+
+    def _post_turn(self, endpoint, payload):
+        """POST a turn to the conversation, chaining on the previous response"""
         if not self.conversation_id:
             print("❌ No conversation created yet")
             return None
 
         try:
-            response = requests.post(
-                f"{BASE_URL}/api/conversations/{self.conversation_id}/message",
-                json={"message": message},
-                timeout=30  # Add timeout to prevent hanging
-            )
+            if self._last_response_id:
+                payload["previous_response_id"] = self._last_response_id
+            # The endpoint does not stream: it answers with one JSON body once the
+            # reply is generated, so the read timeout bounds the silent wait
+            with _TURN_SEMAPHORE:
+                response = SESSION.post(
+                    f"{BASE_URL}/api/conversations/{self.conversation_id}/{endpoint}",
+                    data=orjson.dumps(payload),
+                    timeout=(5, TEST_IDLE_TIMEOUT)
+                )
 
             if response.status_code != 200:
                 print(f"❌ Failed to send message: {response.text}")
                 return None
 
-            return response.json()
+            data = orjson.loads(response.content)
+            self._last_response_id = data.get('response_id')
+            return data
         except requests.exceptions.Timeout:
-            print(f"⚠️  Message request timed out - Locrit may not be running")
+            print(f"⚠️  Message request timed out - no reply after {TEST_IDLE_TIMEOUT:.0f}s, Locrit may not be running")
             return {"response": "[TIMEOUT - Locrit not responding]", "error": "timeout"}
 
+    def _pace(self):
+        """Pause between turns when LOCRIT_TEST_PACING is set"""
+        if TEST_PACING > 0:
+            time.sleep(TEST_PACING)
+
     def get_conversation_history(self):
         """Get the conversation history"""
         if not self.conversation_id:
             return None
 
-        response = requests.get(
+        response = SESSION.get(
             f"{BASE_URL}/api/conversations/{self.conversation_id}",
             timeout=10
         )
@@ -107,7 +196,7 @@ class MemoryTest:
         if response.status_code != 200:
             return None
 
-        return response.json()
+        return orjson.loads(response.content)
 
     def check_memory(self):
         """Check the Locrit's memory directly"""
@@ -115,14 +204,14 @@ class MemoryTest:
 
         # Try to get memory endpoint
         try:
-            response = requests.get(
+            response = SESSION.get(
                 f"{BASE_URL}/api/locrits/{self.locrit_name}/memory",
                 params={"conversation_id": self.conversation_id},
                 timeout=10
             )
 
             if response.status_code == 200:
-                memory_data = response.json()
+                memory_data = orjson.loads(response.content)
                 print(f"✅ Memory retrieved successfully")
                 return memory_data
             else:
@@ -134,78 +223,54 @@ class MemoryTest:
 
     def run_test(self):
         """Run the complete memory test"""
-        print("=" * 80)
+        print(SEP)
         print("🧪 LOCRIT MEMORY PROGRESSION TEST")
-        print("=" * 80)
+        print(SEP)
 
         # Display character info
         print(f"\n📋 Generated Fictive Character:")
-        print(f"   Name: {self.character['name']}")
-        print(f"   Age: {self.character['age']}")
-        print(f"   Occupation: {self.character['occupation']}")
-        print(f"   City: {self.character['city']}")
-        print(f"   Hobby: {self.character['hobby']}")
-        print(f"   Pet: {self.character['pet']}")
-        print(f"   Favorite Color: {self.character['favorite_color']}")
-        print(f"   Personality: {self.character['personality']}")
+        print(format_character(self.character))
 
         # Create conversation
         if not self.create_conversation():
             return False
 
-        # Conversation 1: Introduce name and age
-        print("\n" + "=" * 80)
-        print("📝 CONVERSATION 1: Basic Introduction")
-        print("=" * 80)
-
+        # Conversations 1-3 progressively introduce the character. Only the recall
+        # at the end is checked, so they are sent as one batch with a single reply.
         message1 = f"Hello! I want to tell you about someone named {self.character['name']}. They are {self.character['age']} years old. Please remember this person."
-        print(f"\n👤 User: {message1}")
-
-        response1 = self.send_message(message1)
-        if response1:
-            print(f"🤖 {self.locrit_name}: {response1.get('response')}")
-            time.sleep(2)
-
-        # Conversation 2: Add occupation and city
-        print("\n" + "=" * 80)
-        print("📝 CONVERSATION 2: Adding More Details")
-        print("=" * 80)
-
         message2 = f"{self.character['name']} works as a {self.character['occupation']} and lives in {self.character['city']}. Can you tell me what you know about {self.character['name']} so far?"
-        print(f"\n👤 User: {message2}")
-
-        response2 = self.send_message(message2)
-        if response2:
-            print(f"🤖 {self.locrit_name}: {response2.get('response')}")
-            time.sleep(2)
-
-        # Conversation 3: Add hobby, pet, and personality
-        print("\n" + "=" * 80)
-        print("📝 CONVERSATION 3: Final Details")
-        print("=" * 80)
-
         message3 = f"Some more things about {self.character['name']}: they love {self.character['hobby']}, have a pet {self.character['pet']}, their favorite color is {self.character['favorite_color']}, and they have a {self.character['personality']} personality. What do you remember about this person now?"
-        print(f"\n👤 User: {message3}")
 
-        response3 = self.send_message(message3)
-        if response3:
-            print(f"🤖 {self.locrit_name}: {response3.get('response')}")
-            time.sleep(2)
+        introductions = [
+            ("📝 CONVERSATION 1: Basic Introduction", message1),
+            ("📝 CONVERSATION 2: Adding More Details", message2),
+            ("📝 CONVERSATION 3: Final Details", message3),
+        ]
+        for title, message in introductions:
+            print("\n" + SEP)
+            print(title)
+            print(SEP)
+            print(f"\n👤 User: {message}")
+
+        intro_response = self.send_messages_batch([message for _, message in introductions])
+        if intro_response:
+            print(f"🤖 {self.locrit_name}: {intro_response.get('response')}")
+            self._pace()
 
         # Memory Check 1: Direct memory inspection
-        print("\n" + "=" * 80)
+        print("\n" + SEP)
         print("🔍 MEMORY VERIFICATION 1: Direct Memory Inspection")
-        print("=" * 80)
+        print(SEP)
 
         memory_data = self.check_memory()
         if memory_data:
             print(f"\n📊 Memory contents:")
-            print(json.dumps(memory_data, indent=2))
+            print(orjson.dumps(memory_data, option=orjson.OPT_INDENT_2).decode())
 
         # Memory Check 2: Ask Locrit to recall
-        print("\n" + "=" * 80)
+        print("\n" + SEP)
         print("🔍 MEMORY VERIFICATION 2: Recall Test")
-        print("=" * 80)
+        print(SEP)
 
         recall_message = f"Can you tell me everything you remember about {self.character['name']}? Include all the details I told you."
         print(f"\n👤 User: {recall_message}")
@@ -215,28 +280,22 @@ class MemoryTest:
             print(f"🤖 {self.locrit_name}: {recall_response.get('response')}")
 
         # Memory Check 3: Specific detail recall
-        print("\n" + "=" * 80)
+        print("\n" + SEP)
         print("🔍 MEMORY VERIFICATION 3: Specific Detail Recall")
-        print("=" * 80)
-
-        specific_questions = [
-            f"What is {self.character['name']}'s occupation?",
-            f"Where does {self.character['name']} live?",
-            f"What hobby does {self.character['name']} enjoy?",
-            f"What pet does {self.character['name']} have?"
-        ]
+        print(SEP)
 
-        for question in specific_questions:
+        reply_prefix = f"🤖 {self.locrit_name}: "
+        for question in build_questions(self.character):
             print(f"\n👤 User: {question}")
             q_response = self.send_message(question)
             if q_response:
-                print(f"🤖 {self.locrit_name}: {q_response.get('response')}")
-            time.sleep(1)
+                print(reply_prefix + str(q_response.get('response')))
+            self._pace()
 
         # Final summary
-        print("\n" + "=" * 80)
+        print("\n" + SEP)
         print("📊 TEST SUMMARY")
-        print("=" * 80)
+        print(SEP)
 
         history = self.get_conversation_history()
         if history:
@@ -244,14 +303,7 @@ class MemoryTest:
             print(f"✅ Conversation ID: {self.conversation_id}")
 
         print("\n🎯 Expected Information to Remember:")
-        print(f"   ✓ Name: {self.character['name']}")
-        print(f"   ✓ Age: {self.character['age']}")
-        print(f"   ✓ Occupation: {self.character['occupation']}")
-        print(f"   ✓ City: {self.character['city']}")
-        print(f"   ✓ Hobby: {self.character['hobby']}")
-        print(f"   ✓ Pet: {self.character['pet']}")
-        print(f"   ✓ Favorite Color: {self.character['favorite_color']}")
-        print(f"   ✓ Personality: {self.character['personality']}")
+        print(format_character(self.character, marker="✓ "))
 
         print("\n📝 Review the Locrit's responses above to verify:")
         print("   1. Did it remember the name across all conversations?")
@@ -259,38 +311,67 @@ class MemoryTest:
         print("   3. Can it recall specific details when asked?")
         print("   4. Does the memory persist throughout the conversation?")
 
-        print("\n" + "=" * 80)
+        self.save_state()
+
+        print("\n" + SEP)
         print("✅ Memory test completed!")
-        print("=" * 80)
+        print(SEP)
 
         return True
 
 
-def main():
-    """Main test function"""
-    # Check if server is running
+def check_backend(strict=False):
+    """
+    Check that the backend accepts connections. A raw TCP connect fails fast
+    when the server is down; strict mode also pings the API.
+    """
+    url = urlsplit(BASE_URL)
     try:
-        ping_response = requests.get(f"{BASE_URL}/api/v1/ping", timeout=5)
+        with socket.create_connection((url.hostname, url.port), timeout=0.5):
+            pass
+    except OSError:
+        print(f"❌ Cannot connect to server at {BASE_URL}")
+        print("   Make sure the backend is running")
+        return False
+
+    if not strict:
+        return True
+
+    try:
+        ping_response = SESSION.get(f"{BASE_URL}/api/v1/ping", timeout=5)
         if ping_response.status_code != 200:
             print("❌ Server is not responding correctly")
-            sys.exit(1)
+            return False
     except requests.exceptions.ConnectionError:
         print(f"❌ Cannot connect to server at {BASE_URL}")
         print("   Make sure the backend is running")
-        sys.exit(1)
+        return False
     except requests.exceptions.Timeout:
         print(f"❌ Server at {BASE_URL} timed out")
         print("   Server may be overloaded or unresponsive")
+        return False
+
+    return True
+
+
+def main():
+    """Main test function"""
+    strict = '--strict' in sys.argv
+    resume = '--resume' in sys.argv
+    args = [arg for arg in sys.argv[1:] if arg not in ('--strict', '--resume')]
+
+    # Check if server is running
+    if not check_backend(strict):
         sys.exit(1)
 
     # Get Locrit name from command line or use default
-    locrit_name = sys.argv[1] if len(sys.argv) > 1 else DEFAULT_LOCRIT
+    locrit_name = args[0] if args else DEFAULT_LOCRIT
 
     print(f"\n⚠️  NOTE: This test requires the Locrit '{locrit_name}' to be running and responding.")
     print(f"   If messages timeout, make sure the Locrit is active and configured properly.\n")
 
     # Run the test
-    test = MemoryTest(locrit_name)
+    test = MemoryTest(locrit_name, resume=resume)
     success = test.run_test()
 
     if not success:
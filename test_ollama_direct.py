@@ -1,55 +1,97 @@
 #!/usr/bin/env python3
 """Quick test of Ollama integration"""
 
+import sys
+import time
+
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
 
-# Test Ollama directly
-print("Testing Ollama...")
-response = requests.post(
-    "http://localhost:11434/api/generate",
-    json={
-        "model": "llama3.1:8b-instruct-q3_K_M",
-        "prompt": "Say hello in one sentence",
-        "stream": False
-    },
-    timeout=30
-)
-
-if response.status_code == 200:
-    result = response.json()
-    print(f"✅ Ollama works: {result.get('response', '')[:100]}...")
-else:
-    print(f"❌ Ollama failed: {response.status_code}")
-
-# Test conversation API
-print("\nTesting Conversation API...")
-import time
+OLLAMA_URL = "http://localhost:11434"
+BASE_URL = "http://localhost:5000"
+
+# One session for both hosts: urllib3 keeps one pool per host, so the create
+# and message POSTs to the backend reuse the same connection
+SESSION = requests.Session()
+SESSION.headers['Content-Type'] = 'application/json'
+SESSION.mount('http://', HTTPAdapter(pool_connections=2, pool_maxsize=4))
+
+
+def check_ollama_generate(session=SESSION):
+    """Test Ollama directly, streaming so the first token is reported as it arrives"""
+    print("Testing Ollama...")
+    start = time.monotonic()
+    response = session.post(
+        f"{OLLAMA_URL}/api/generate",
+        data=orjson.dumps({
+            "model": "llama3.1:8b-instruct-q3_K_M",
+            "prompt": "Say hello in one sentence",
+            "stream": True
+        }),
+        stream=True,
+        timeout=30
+    )
+
+    if response.status_code != 200:
+        print(f"❌ Ollama failed: {response.status_code}")
+        return False
 
-# Create conversation
-create_resp = requests.post(
-    "http://localhost:5000/api/conversations/create",
-    json={"locrit_name": "Bob Technique", "user_id": "quick_test"}
-)
+    ttft = None
+    print("✅ Ollama works: ", end="")
+    for line in response.iter_lines():
+        if not line:
+            continue
+        chunk = orjson.loads(line)
+        if ttft is None:
+            ttft = time.monotonic() - start
+        sys.stdout.write(chunk.get('response', ''))
+        sys.stdout.flush()
+        if chunk.get('done'):
+            break
+    total = time.monotonic() - start
+    print(f"\n   Time to first token: {ttft:.2f}s" if ttft is not None else "\n   No tokens received")
+    print(f"   Total generation time: {total:.2f}s")
+    return ttft is not None
 
-if create_resp.status_code == 200:
-    conv_id = create_resp.json()['conversation_id']
+
+def check_conversation_api(session=SESSION):
+    """Create a conversation and send it one message"""
+    print("\nTesting Conversation API...")
+
+    # Create conversation
+    create_resp = session.post(
+        f"{BASE_URL}/api/conversations/create",
+        data=orjson.dumps({"locrit_name": "Bob Technique", "user_id": "quick_test"})
+    )
+
+    if create_resp.status_code != 200:
+        print(f"❌ Create failed: {create_resp.status_code}")
+        return False
+
+    conv_id = orjson.loads(create_resp.content)['conversation_id']
     print(f"✅ Conversation created: {conv_id[:16]}...")
 
     # Send message
     print("Sending message...")
     start = time.time()
-    msg_resp = requests.post(
-        f"http://localhost:5000/api/conversations/{conv_id}/message",
-        json={"message": "Say hello"},
+    msg_resp = session.post(
+        f"{BASE_URL}/api/conversations/{conv_id}/message",
+        data=orjson.dumps({"message": "Say hello"}),
         timeout=90
     )
     duration = time.time() - start
 
-    if msg_resp.status_code == 200:
-        print(f"✅ Message sent successfully in {duration:.2f}s")
-        print(f"   Response: {msg_resp.json().get('response', '')[:100]}...")
-    else:
+    if msg_resp.status_code != 200:
         print(f"❌ Message failed: {msg_resp.status_code}")
         print(f"   Error: {msg_resp.text[:200]}")
-else:
-    print(f"❌ Create failed: {create_resp.status_code}")
+        return False
+
+    print(f"✅ Message sent successfully in {duration:.2f}s")
+    print(f"   Response: {orjson.loads(msg_resp.content).get('response', '')[:100]}...")
+    return True
+
+
+if __name__ == "__main__":
+    check_ollama_generate()
+    check_conversation_api()
@@ -4,10 +4,35 @@ WebSocket Chat Storage Test
 Tests that conversations via WebSocket are properly stored.
 """
 
+import atexit
+import base64
+import random
 import socketio
+import threading
 import time
 import asyncio
-from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Shared HTTP session so memory verification calls reuse one connection
+_SESSION = requests.Session()
+_SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+atexit.register(_SESSION.close)
+
+CONNECT_ATTEMPTS = 6
+
+
+def connect_with_backoff(sio, url, **kwargs):
+    """Connect, retrying with jittered exponential backoff while the backend boots"""
+    for attempt in range(CONNECT_ATTEMPTS):
+        try:
+            sio.connect(url, **kwargs)
+            return
+        except socketio.exceptions.ConnectionError:
+            if attempt == CONNECT_ATTEMPTS - 1:
+                raise
+            time.sleep(min(0.1 * 2 ** attempt, 2.0) * (0.7 + 0.6 * random.random()))
 
 
 def print_separator(char="=", length=80):
@@ -32,50 +57,86 @@ def print_info(text):
     print(f"ℹ️  {text}")
 
 
-def test_websocket_chat_storage():
-    """Test WebSocket chat with conversation storage"""
+class ChatTestClient:
+    """Socket.IO client that collects one streamed chat reply at a time"""
 
-    BASE_URL = "http://localhost:5000"
-    LOCRIT_NAME = "Bob Technique"
-    SESSION_ID = f"test_ws_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    # The backend registers its chat handlers on the default namespace
+    NAMESPACE = '/'
 
-    print_header("TEST 1: Connect to WebSocket")
+    def __init__(self):
+        self.sio = socketio.Client()
+        self.chunks = bytearray()
+        self.done = threading.Event()
+        self.connected = threading.Event()
+        self.joined = threading.Event()
 
-    # Create SocketIO client
-    sio = socketio.Client()
-    received_messages = []
-    chat_complete = False
+        handlers = {
+            'connected': self._connected,
+            'joined_chat': self._joined_chat,
+            'chat_chunk': self._chunk,
+            'chat_complete': self._complete,
+            'error': self._error,
+        }
+        for event, handler in handlers.items():
+            self.sio.on(event, handler, namespace=self.NAMESPACE)
 
-    @sio.on('connected')
-    def on_connected(data):
+    def _connected(self, data):
+        self.connected.set()
         print_success(f"Connected to WebSocket: {data}")
 
-    @sio.on('joined_chat')
-    def on_joined_chat(data):
+    def _joined_chat(self, data):
+        self.joined.set()
         print_success(f"Joined chat room: {data.get('room')}")
 
-    @sio.on('chat_chunk')
-    def on_chat_chunk(data):
-        content = data.get('content', '')
-        if content:
-            received_messages.append(content)
+    def _chunk(self, data):
+        self.chunks.extend(data.get('content', '').encode())
 
-    @sio.on('chat_complete')
-    def on_chat_complete(data):
-        nonlocal chat_complete
-        chat_complete = True
+    def _complete(self, data):
+        self.done.set()
         print_info("Chat response completed")
 
-    @sio.on('error')
-    def on_error(data):
+    def _error(self, data):
         print_error(f"WebSocket error: {data}")
 
+    def reset(self):
+        """Prepare for the next reply"""
+        self.chunks.clear()
+        self.done.clear()
+
+    @property
+    def response(self):
+        return self.chunks.decode()
+
+    def connect(self, url):
+        connect_with_backoff(self.sio, url, namespaces=[self.NAMESPACE])
+
+    def emit(self, event, data):
+        self.sio.emit(event, data, namespace=self.NAMESPACE)
+
+    def disconnect(self):
+        self.sio.disconnect()
+
+
+def test_websocket_chat_storage():
+    """Test WebSocket chat with conversation storage"""
+
+    BASE_URL = "http://localhost:5000"
+    LOCRIT_NAME = "Bob Technique"
+    SESSION_ID = 'test_ws_' + base64.b32encode(time.time_ns().to_bytes(8, 'big')).decode().rstrip('=').lower()
+
+    print_header("TEST 1: Connect to WebSocket")
+
+    # Create SocketIO client
+    client = ChatTestClient()
+
     # Connect to server
     try:
-        sio.connect(BASE_URL, namespaces=['/chat'])
+        client.connect(BASE_URL)
+        if not client.connected.wait(5):
+            raise TimeoutError("server never confirmed the connection")
         print_success("WebSocket connection established")
-        time.sleep(0.5)
     except Exception as e:
+        client.disconnect()
         print_error(f"Failed to connect to WebSocket: {e}")
         print_info("Make sure backend is running: python web_app.py")
         return False
@@ -84,16 +145,17 @@ def test_websocket_chat_storage():
     print_header("TEST 2: Join Chat Room")
 
     try:
-        sio.emit('join_chat', {
+        client.emit('join_chat', {
             'locrit_name': LOCRIT_NAME,
             'session_id': SESSION_ID
-        }, namespace='/chat')
+        })
 
-        time.sleep(0.5)
+        if not client.joined.wait(5):
+            raise TimeoutError("server never confirmed the join")
         print_success("Joined chat room")
     except Exception as e:
         print_error(f"Failed to join chat: {e}")
-        sio.disconnect()
+        client.disconnect()
         return False
 
     # ========================================================================
@@ -103,37 +165,30 @@ def test_websocket_chat_storage():
     print_info(f"Sending: {test_message}")
 
     try:
-        received_messages.clear()
-        chat_complete = False
+        client.reset()
 
-        sio.emit('chat_message', {
+        client.emit('chat_message', {
             'locrit_name': LOCRIT_NAME,
             'session_id': SESSION_ID,
             'message': test_message,
             'stream': True
-        }, namespace='/chat')
+        })
 
         # Wait for response
-        timeout = 30
-        start_time = time.time()
-
-        while not chat_complete and (time.time() - start_time) < timeout:
-            time.sleep(0.1)
-
-        if chat_complete:
-            full_response = ''.join(received_messages)
-            print_success(f"Received response ({len(full_response)} chars)")
-            print_info(f"Response preview: {full_response[:100]}...")
-        else:
+        if not client.done.wait(30):
             print_error("Timeout waiting for response")
-            sio.disconnect()
+            client.disconnect()
             return False
 
+        full_response = client.response
+        print_success(f"Received response ({len(full_response)} chars)")
+        print_info(f"Response preview: {full_response[:100]}...")
+
     except Exception as e:
         print_error(f"Failed to send message: {e}")
         import traceback
         traceback.print_exc()
-        sio.disconnect()
+        client.disconnect()
         return False
 
     # Wait for storage to complete
@@ -142,13 +197,11 @@ def test_websocket_chat_storage():
     # ========================================================================
     print_header("TEST 4: Verify Message Storage via Memory API")
 
-    sio.disconnect()
-
-    import requests
+    client.disconnect()
 
     try:
         # Check memory summary
-        response = requests.get(
+        response = _SESSION.get(
             f"{BASE_URL}/api/locrits/{LOCRIT_NAME}/memory/summary",
             timeout=10
         )
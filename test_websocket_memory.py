@@ -3,62 +3,76 @@
 Test WebSocket conversation context and memory functionality
 """
 
+import asyncio
+import random
 import socketio
 import time
-import sys
 
 # Create a Socket.IO client
-sio = socketio.Client()
+sio = socketio.AsyncClient()
 
 # Configuration
 BASE_URL = "http://localhost:5000"
 LOCRIT_NAME = "Bob Technique"
 TEST_NAME = "WebSocketTester"
+SESSION_ID = f"test_ws_memory_{int(time.time())}"
+RESPONSE_TIMEOUT = 30
+CONNECT_ATTEMPTS = 6
 
-# Variables to track responses
-responses = []
-response_count = 0
-
-@sio.on('connect')
-def on_connect():
+async def on_connect():
     print("🔌 Connected to WebSocket server")
 
-@sio.on('connected')
-def on_connected(data):
+async def on_connected(data):
     print(f"✅ Server confirmed connection: {data}")
 
-@sio.on('joined_chat')
-def on_joined_chat(data):
+async def on_joined_chat(data):
     print(f"✅ Joined chat room for: {data.get('locrit_name', 'Unknown')}")
 
-@sio.on('chat_chunk')
-def on_chat_chunk(data):
-    global response_count
-    if data.get('locrit_name') == LOCRIT_NAME:
-        responses.append(data.get('content', ''))
-
-@sio.on('chat_complete')
-def on_chat_complete(data):
-    global response_count
-    response_count += 1
-    if data.get('locrit_name') == LOCRIT_NAME:
-        full_response = ''.join(responses)
-        print(f"🤖 Full response {response_count}: {full_response[:100]}...")
-        responses.clear()  # Clear for next message
-
-@sio.on('error')
-def on_error(data):
+async def on_error(data):
     print(f"❌ WebSocket error: {data}")
 
-def send_message(message):
+HANDLERS = {
+    'connect': on_connect,
+    'connected': on_connected,
+    'joined_chat': on_joined_chat,
+    'error': on_error,
+}
+for event, handler in HANDLERS.items():
+    sio.on(event, handler)
+
+async def connect_with_backoff(url):
+    """Connect, retrying with jittered exponential backoff while the backend boots"""
+    for attempt in range(CONNECT_ATTEMPTS):
+        try:
+            await sio.connect(url)
+            return
+        except socketio.exceptions.ConnectionError:
+            if attempt == CONNECT_ATTEMPTS - 1:
+                raise
+            await asyncio.sleep(min(0.1 * 2 ** attempt, 2.0) * (0.7 + 0.6 * random.random()))
+
+async def send_message(message):
+    """Send a message and wait for the server to acknowledge the full reply"""
     print(f"📤 Sending: {message}")
-    sio.emit('chat_message', {
-        'locrit_name': LOCRIT_NAME,
-        'message': message,
-        'stream': True
-    })
-
-def test_websocket_memory():
+    try:
+        ack = await sio.call('chat_message', {
+            'locrit_name': LOCRIT_NAME,
+            'session_id': SESSION_ID,
+            'message': message,
+            'stream': True
+        }, timeout=RESPONSE_TIMEOUT)
+    except socketio.exceptions.TimeoutError:
+        print(f"⚠️  No response after {RESPONSE_TIMEOUT}s")
+        return None
+
+    if not ack or not ack.get('success'):
+        return None
+
+    full_response = ack.get('response', '')
+    print(f"🤖 Full response: {full_response[:100]}...")
+    return full_response
+
+async def test_websocket_memory():
     """Test WebSocket conversation memory"""
 
     try:
@@ -66,42 +80,30 @@ def test_websocket_memory():
         print("🧪 Testing WebSocket Conversation Memory")
         print("=" * 50)
 
-        sio.connect(BASE_URL)
+        await connect_with_backoff(BASE_URL)
 
         # Join the chat room
-        sio.emit('join_chat', {'locrit_name': LOCRIT_NAME})
-
-        # Wait for connection setup
-        time.sleep(2)
+        await sio.emit('join_chat', {'locrit_name': LOCRIT_NAME, 'session_id': SESSION_ID})
 
         print("\n🧠 Step 1: Introducing ourselves...")
-        send_message(f"Hello! My name is {TEST_NAME}. Please remember my name.")
-
-        # Wait for response
-        time.sleep(8)
+        await send_message(f"Hello! My name is {TEST_NAME}. Please remember my name.")
 
         print("\n🔍 Step 2: Testing name recall...")
-        send_message("What is my name?")
-
-        # Wait for response
-        time.sleep(8)
+        await send_message("What is my name?")
 
         print("\n📝 Step 3: Testing conversation continuity...")
-        send_message("Can you tell me what we just talked about?")
-
-        # Wait for response
-        time.sleep(8)
+        await send_message("Can you tell me what we just talked about?")
 
         print("\n✅ WebSocket memory test completed!")
         print("Check the responses above to see if:")
         print("1. The Locrit remembered your name")
         print("2. The Locrit referenced previous conversation")
 
-        sio.disconnect()
+        await sio.disconnect()
 
     except Exception as e:
         print(f"❌ Test failed: {e}")
         return False
 
 if __name__ == "__main__":
-    test_websocket_memory()
\ No newline at end of file
+    asyncio.run(test_websocket_memory())
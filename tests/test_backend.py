@@ -0,0 +1,92 @@
+"""
+Backend integration tests against a running Locrit server.
+
+Runs the scenarios of the standalone scripts (test_memory_progression*.py,
+test_ollama_direct.py, test_ollama_integration.py) in a single interpreter,
+sharing one HTTP session and one backend probe.
+Tests are skipped when the backend (or Ollama) is not reachable.
+
+    python -m pytest tests/test_backend.py -v
+"""
+
+import asyncio
+import socket
+import sys
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import memory_test_common
+import test_memory_progression as memory_progression
+import test_memory_progression_simple as memory_progression_simple
+import test_ollama_direct as ollama_direct
+import test_ollama_integration as ollama_integration
+
+
+def _accepts_connections(base_url):
+    """Return True if something is listening at base_url"""
+    url = urlsplit(base_url)
+    try:
+        with socket.create_connection((url.hostname, url.port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+@pytest.fixture(scope="session")
+def backend_up():
+    """Skip the backend tests when the Locrit server is not running"""
+    if not _accepts_connections(memory_progression.BASE_URL):
+        pytest.skip(f"Backend not running at {memory_progression.BASE_URL}")
+
+
+@pytest.fixture(scope="session")
+def ollama_up():
+    """Skip the direct Ollama tests when Ollama is not running"""
+    if not _accepts_connections(ollama_direct.OLLAMA_URL):
+        pytest.skip(f"Ollama not running at {ollama_direct.OLLAMA_URL}")
+
+
+@pytest.fixture(scope="session")
+def http_session():
+    """One requests.Session (with its retry policy) shared by every script under test"""
+    return memory_test_common.SESSION
+
+
+@pytest.fixture(scope="session")
+def ollama_integration_results(backend_up):
+    """Run the concurrent Ollama integration stages once, keyed by test name"""
+    results = asyncio.run(ollama_integration.run_all())
+    return {name: (passed, lines) for name, passed, lines in results}
+
+
+@pytest.mark.parametrize(
+    "test_name",
+    [name for stage in ollama_integration.TEST_STAGES for name, _ in stage]
+)
+def test_ollama_integration(ollama_integration_results, test_name):
+    passed, lines = ollama_integration_results[test_name]
+    print("\n".join(lines))
+    assert passed
+
+
+def test_ollama_generate(ollama_up, http_session):
+    assert ollama_direct.check_ollama_generate(http_session)
+
+
+def test_ollama_conversation_message(backend_up, http_session):
+    assert ollama_direct.check_conversation_api(http_session)
+
+
+def test_conversation_api(backend_up, http_session):
+    assert memory_progression_simple.test_conversation_api()
+
+
+def test_memory_progression(backend_up, http_session, tmp_path, monkeypatch):
+    # Keep the --resume state of manual runs out of the test run
+    monkeypatch.setattr(memory_progression, "STATE_PATH", tmp_path / "locrit_test_state.json")
+    test = memory_progression.MemoryTest(memory_progression.DEFAULT_LOCRIT)
+    assert test.run_test()
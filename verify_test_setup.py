@@ -4,9 +4,13 @@ Test Setup Verification Script
 Verifies that all dependencies and configurations are ready for fullstack testing
 """
 
+import importlib.util
 import os
+import shutil
 import sys
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from typing import List, Tuple
 
 
@@ -26,13 +30,12 @@ def check_python_version() -> Tuple[bool, str]:
     return False, f"Python {version.major}.{version.minor} (requires 3.8+)"
 
 
+@lru_cache(maxsize=None)
 def check_module(module_name: str) -> Tuple[bool, str]:
-    """Check if a Python module is installed"""
-    try:
-        __import__(module_name)
+    """Check if a Python module is installed, without importing it"""
+    if importlib.util.find_spec(module_name) is not None:
         return True, f"{module_name} installed"
-    except ImportError:
-        return False, f"{module_name} not found"
+    return False, f"{module_name} not found"
 
 
 def check_firebase_config() -> Tuple[bool, str]:
@@ -46,10 +49,15 @@ def check_firebase_config() -> Tuple[bool, str]:
         "FIREBASE_API_KEY",
     ]
 
+    # Collect the defined keys once, skipping comments and blank lines
+    keys = set()
     with open(env_file, 'r') as f:
-        content = f.read()
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#') and '=' in line:
+                keys.add(line.split('=', 1)[0].strip())
 
-    missing = [var for var in required_vars if var not in content]
+    missing = [var for var in required_vars if var not in keys]
 
     if missing:
         return False, f"Missing vars: {', '.join(missing)}"
@@ -73,11 +81,15 @@ def check_firebase_service() -> Tuple[bool, str]:
         return False, f"Error: {str(e)[:50]}"
 
 
+@lru_cache(maxsize=None)
 def check_node_installed() -> Tuple[bool, str]:
     """Check if Node.js is installed"""
+    path = shutil.which('node')
+    if path is None:
+        return False, "Node.js not found"
     try:
         result = subprocess.run(
-            ['node', '--version'],
+            [path, '--version'],
             capture_output=True,
             text=True,
             timeout=5
@@ -90,11 +102,15 @@ def check_node_installed() -> Tuple[bool, str]:
         return False, "Node.js not found"
 
 
+@lru_cache(maxsize=None)
 def check_npm_installed() -> Tuple[bool, str]:
     """Check if npm is installed"""
+    path = shutil.which('npm')
+    if path is None:
+        return False, "npm not found"
     try:
         result = subprocess.run(
-            ['npm', '--version'],
+            [path, '--version'],
             capture_output=True,
             text=True,
             timeout=5
@@ -107,27 +123,39 @@ def check_npm_installed() -> Tuple[bool, str]:
         return False, "npm not found"
 
 
+@lru_cache(maxsize=None)
+def _scan_node_modules(scope: str = "") -> frozenset:
+    """List platform/node_modules (or one of its @scope directories) once for the platform checks"""
+    try:
+        with os.scandir(os.path.join("platform/node_modules", scope)) as entries:
+            return frozenset(entry.name for entry in entries)
+    except FileNotFoundError:
+        return frozenset()
+
+
 def check_platform_dependencies() -> Tuple[bool, str]:
     """Check if platform dependencies are installed"""
-    node_modules = "platform/node_modules"
-    if os.path.exists(node_modules):
+    if _scan_node_modules():
         return True, "Platform dependencies installed"
     return False, "Run 'npm install' in platform/"
 
 
 def check_playwright() -> Tuple[bool, str]:
     """Check if Playwright is installed"""
-    playwright_path = "platform/node_modules/@playwright/test"
-    if os.path.exists(playwright_path):
+    if "test" in _scan_node_modules("@playwright"):
         return True, "Playwright installed"
     return False, "Run 'npx playwright install' in platform/"
 
 
+@lru_cache(maxsize=None)
 def check_firebase_emulators() -> Tuple[bool, str]:
     """Check if Firebase emulators are available"""
+    path = shutil.which('firebase')
+    if path is None:
+        return False, "Firebase CLI not found (optional)"
     try:
         result = subprocess.run(
-            ['firebase', '--version'],
+            [path, '--version'],
             capture_output=True,
             text=True,
             timeout=5
@@ -140,11 +168,11 @@ def check_firebase_emulators() -> Tuple[bool, str]:
         return False, "Firebase CLI not found (optional)"
 
 
-def print_check(name: str, passed: bool, message: str):
-    """Print a check result"""
+def format_check(name: str, passed: bool, message: str) -> str:
+    """Format a check result as one report line"""
     status = f"{Colors.GREEN}✓{Colors.NC}" if passed else f"{Colors.RED}✗{Colors.NC}"
     color = Colors.GREEN if passed else Colors.RED
-    print(f"{status} {name:.<40} {color}{message}{Colors.NC}")
+    return f"{status} {name:.<40} {color}{message}{Colors.NC}\n"
 
 
 def main():
@@ -152,38 +180,44 @@ def main():
     print(f"{Colors.BLUE}Locrits Fullstack Test Setup Verification{Colors.NC}")
     print(f"{Colors.BLUE}{'='*60}{Colors.NC}\n")
 
-    checks: List[Tuple[str, Tuple[bool, str]]] = []
-
-    print(f"{Colors.YELLOW}Python Environment{Colors.NC}")
-    print("-" * 60)
-    checks.append(("Python Version", check_python_version()))
-    checks.append(("pytest", check_module("pytest")))
-    checks.append(("pytest-asyncio", check_module("pytest_asyncio")))
-    checks.append(("Firebase Admin SDK", check_module("firebase_admin")))
-    print()
-
-    print(f"{Colors.YELLOW}Firebase Configuration{Colors.NC}")
-    print("-" * 60)
-    checks.append(("Firebase Config (.env)", check_firebase_config()))
-    checks.append(("Firebase Service", check_firebase_service()))
-    print()
-
-    print(f"{Colors.YELLOW}Node.js Environment{Colors.NC}")
-    print("-" * 60)
-    checks.append(("Node.js", check_node_installed()))
-    checks.append(("npm", check_npm_installed()))
-    checks.append(("Platform Dependencies", check_platform_dependencies()))
-    checks.append(("Playwright", check_playwright()))
-    print()
-
-    print(f"{Colors.YELLOW}Optional Tools{Colors.NC}")
-    print("-" * 60)
-    checks.append(("Firebase CLI (Emulators)", check_firebase_emulators()))
-    print()
-
-    # Print all checks
-    for name, (passed, message) in checks:
-        print_check(name, passed, message)
+    sections = [
+        ("Python Environment", [
+            ("Python Version", check_python_version),
+            ("pytest", partial(check_module, "pytest")),
+            ("pytest-asyncio", partial(check_module, "pytest_asyncio")),
+            ("Firebase Admin SDK", partial(check_module, "firebase_admin")),
+        ]),
+        ("Firebase Configuration", [
+            ("Firebase Config (.env)", check_firebase_config),
+            ("Firebase Service", check_firebase_service),
+        ]),
+        ("Node.js Environment", [
+            ("Node.js", check_node_installed),
+            ("npm", check_npm_installed),
+            ("Platform Dependencies", check_platform_dependencies),
+            ("Playwright", check_playwright),
+        ]),
+        ("Optional Tools", [
+            ("Firebase CLI (Emulators)", check_firebase_emulators),
+        ]),
+    ]
+    checks_spec = [check for _, section_checks in sections for check in section_checks]
+
+    for title, _ in sections:
+        print(f"{Colors.YELLOW}{title}{Colors.NC}")
+        print("-" * 60)
+        print()
+
+    # The checks are independent and mostly wait on subprocesses or imports,
+    # so run them all at once; results keep declaration order
+    with ThreadPoolExecutor(max_workers=len(checks_spec)) as executor:
+        futures = [executor.submit(check) for _, check in checks_spec]
+        checks: List[Tuple[str, Tuple[bool, str]]] = [
+            (name, future.result()) for (name, _), future in zip(checks_spec, futures)
+        ]
+
+    # Print all checks in one write
+    sys.stdout.write(''.join(format_check(name, passed, message) for name, (passed, message) in checks))
 
     # Summary
     print(f"\n{Colors.BLUE}{'='*60}{Colors.NC}")
@@ -5,16 +5,33 @@ Web UI pour Locrit - Interface web moderne pour gérer les Locrits
 
 import os
 import json
+import asyncio
+import threading
+import time
+import orjson
+import queue
+import httpx
+from dataclasses import dataclass
 from datetime import datetime
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify, g
 from flask_cors import CORS
 from functools import wraps
+from src.utils.json_provider import OrjsonProvider
 from src.services.config_service import config_service
 from src.services.auth_service import auth_service
 from src.services.ui_logging_service import ui_logging_service
+from src.services.ollama_service import OllamaService, CONNECTION_CHECK_TTL
+
+try:
+    from flask_compress import Compress
+    FLASK_COMPRESS_AVAILABLE = True
+except ImportError:
+    FLASK_COMPRESS_AVAILABLE = False
 
 app = Flask(__name__)
 app.secret_key = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key-change-in-production')
+# jsonify() et request.get_json() passent par orjson
+app.json = OrjsonProvider(app)
 
 # Enable CORS for React frontend
 CORS(app, origins=['http://localhost:5174', 'http://localhost:5174'])
@@ -24,11 +41,217 @@ app.config.update(
     SESSION_COOKIE_SECURE=False,  # True en production avec HTTPS
     SESSION_COOKIE_HTTPONLY=True,
     SESSION_COOKIE_SAMESITE='Lax',
+    # Compression des réponses JSON et des pages (si flask-compress est installé) ;
+    # text/event-stream en est exclu pour ne pas retenir les trames du streaming
+    COMPRESS_ALGORITHM=['br', 'gzip', 'deflate'],
+    COMPRESS_MIN_SIZE=500,
+    COMPRESS_MIMETYPES=['text/html', 'text/css', 'application/javascript', 'application/json'],
+    COMPRESS_STREAMS=False,
 )
 
+if FLASK_COMPRESS_AVAILABLE:
+    Compress(app)
+
 # Logger pour l'application web
 logger = ui_logging_service.logger
 
+# Boucle asyncio persistante pour les appels Ollama depuis les vues synchrones :
+# évite de recréer une boucle (et les connexions HTTP) à chaque requête
+_LOOP = asyncio.new_event_loop()
+threading.Thread(target=_LOOP.run_forever, name='ollama-loop', daemon=True).start()
+
+# Services Ollama par serveur, utilisés uniquement sur _LOOP pour que leur
+# client HTTP garde ses connexions ouvertes d'une requête à l'autre
+_ollama_services = {}
+_ollama_services_lock = threading.Lock()
+
+
+def _run_async(coro, timeout=120):
+    """Exécute une coroutine sur la boucle persistante et attend son résultat"""
+    return asyncio.run_coroutine_threadsafe(coro, _LOOP).result(timeout=timeout)
+
+
+# Horodatage ISO de la seconde courante, recalculé au plus une fois par seconde
+_ts_cache = [0, '']
+
+
+def _iso_now():
+    """Horodatage ISO (à la seconde) pour les réponses de l'API v1"""
+    t = int(time.time())
+    if t != _ts_cache[0]:
+        _ts_cache[0] = t
+        _ts_cache[1] = datetime.fromtimestamp(t).isoformat()
+    return _ts_cache[1]
+
+
+# Regroupement des tokens en streaming : taille (caractères) ou délai (secondes) avant envoi
+SSE_FLUSH_SIZE = 32
+SSE_FLUSH_INTERVAL = 0.015
+
+
+# Marque la fin d'un flux produit par _iter_chat_stream
+_STREAM_END = object()
+
+
+def _iter_chat_stream(ollama_service, **kwargs):
+    """
+    Itère de façon synchrone sur un chat Ollama en streaming lu par le client
+    asynchrone du service sur _LOOP. Une file découple la lecture d'Ollama de
+    l'envoi au client HTTP ; la lecture est annulée si le client se déconnecte
+    """
+    chunks = queue.Queue()
+
+    async def produce():
+        try:
+            async for chunk in await ollama_service.client.chat(stream=True, **kwargs):
+                chunks.put(chunk)
+        except Exception as e:
+            chunks.put(e)
+        finally:
+            chunks.put(_STREAM_END)
+
+    future = asyncio.run_coroutine_threadsafe(produce(), _LOOP)
+    try:
+        while True:
+            chunk = chunks.get()
+            if chunk is _STREAM_END:
+                return
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        future.cancel()
+
+
+def _stream_contents(stream):
+    """Extrait le texte des morceaux d'un chat Ollama en streaming, regroupé en lots"""
+    buffer = []
+    buffered = 0
+    last_flush = time.monotonic()
+
+    for chunk in stream:
+        if 'message' in chunk and 'content' in chunk['message']:
+            content = chunk['message']['content']
+            if content:
+                buffer.append(content)
+                buffered += len(content)
+                now = time.monotonic()
+                if buffered >= SSE_FLUSH_SIZE or now - last_flush >= SSE_FLUSH_INTERVAL:
+                    yield ''.join(buffer)
+                    buffer.clear()
+                    buffered = 0
+                    last_flush = now
+
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _get_ollama_service(settings):
+    """Retourne le service Ollama partagé pour le serveur configuré d'un Locrit"""
+    base_url = settings.get('ollama_url')
+    if not base_url:
+        raise ValueError("Aucun serveur Ollama configuré pour ce Locrit")
+    with _ollama_services_lock:
+        service = _ollama_services.get(base_url)
+        if service is None:
+            service = _ollama_services[base_url] = OllamaService(base_url)
+    return service
+
+
+def _prewarm_ollama():
+    """
+    Ouvre à l'avance les connexions vers les serveurs Ollama des Locrits actifs
+    (test de connexion et client asynchrone utilisé pour le chat), pour que la
+    première requête de chat ne paie pas l'établissement de la connexion
+    """
+    base_urls = {settings.get('ollama_url') for _, settings in config_service.list_active_locrits()}
+    for base_url in filter(None, base_urls):
+        try:
+            service = _get_ollama_service({'ollama_url': base_url})
+            if not service.test_connection().get('success'):
+                logger.warning(f"Ollama injoignable au démarrage: {base_url}")
+                continue
+            _run_async(service.client.list(), timeout=10)
+        except Exception as e:
+            logger.warning(f"Préchauffage Ollama impossible pour {base_url}: {str(e)}")
+
+
+def start_ollama_prewarm():
+    """
+    Lance _prewarm_ollama en arrière-plan, pour ne pas retarder le démarrage si
+    un serveur Ollama est injoignable. Appelé au lancement du serveur (__main__,
+    ou hook post_worker_init de gunicorn_legacy.conf.py), jamais à l'import
+    """
+    threading.Thread(target=_prewarm_ollama, name='ollama-prewarm', daemon=True).start()
+
+
+@dataclass(slots=True)
+class PreparedChat:
+    """Requête de chat inter-Locrits validée, prête à être envoyée à Ollama"""
+    ollama_service: OllamaService
+    model: str
+    system_prompt: str
+    message: str
+    sender_name: str
+
+
+def _prepare_chat(locrit_name):
+    """
+    Valide une requête de chat de l'API v1 et assemble le prompt système.
+    Retourne (PreparedChat, None), ou (None, réponse d'erreur) à renvoyer telle quelle
+    """
+    # Locrit déjà validé par require_open_locrit
+    settings, base_prompt = config_service.get_locrit_base_prompt(locrit_name, g.locrit_settings)
+
+    # Récupérer le message et les métadonnées
+    data = request.get_json()
+    message = data.get('message') if isinstance(data, dict) else None
+    if not isinstance(message, str):
+        return None, (jsonify({'error': 'Message requis'}), 400)
+
+    # strip() rend la chaîne elle-même quand il n'y a rien à retirer
+    message = message.strip()
+    if not message:
+        return None, (jsonify({'error': 'Message vide'}), 400)
+
+    # Métadonnées optionnelles pour le contexte
+    sender_name = data.get('sender_name', 'Locrit externe')
+    sender_type = data.get('sender_type', 'locrit')
+    context = data.get('context', '')
+
+    # Utiliser le service Ollama du Locrit pour générer la réponse
+    try:
+        ollama_service = _get_ollama_service(settings)
+    except ValueError as e:
+        return None, (jsonify({'error': f'Service Ollama non disponible: {str(e)}'}), 503)
+
+    # Configurer le modèle du Locrit
+    model = settings.get('ollama_model')
+    if not model:
+        return None, (jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400)
+
+    # Test de connexion
+    connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
+    if not connection_test.get('success'):
+        return None, (jsonify({'error': 'Service Ollama non disponible'}), 500)
+
+    # Préparer le prompt système enrichi avec le contexte, assemblé en une seule
+    # copie (le début, partagé avec le cache, ne peut pas être étendu sur place)
+    parts = [base_prompt]
+    if sender_name and sender_type == 'locrit':
+        parts.append(f"\n\nTu es en train de communiquer avec {sender_name}, un autre Locrit.")
+    if context:
+        parts.append(f"\n\nContexte de la conversation: {context}")
+    system_prompt = ''.join(parts)
+
+    return PreparedChat(
+        ollama_service=ollama_service,
+        model=model,
+        system_prompt=system_prompt,
+        message=message,
+        sender_name=sender_name
+    ), None
+
 
 def login_required(f):
     """Décorateur pour protéger les routes nécessitant une authentification"""
@@ -41,6 +264,28 @@ def login_required(f):
     return decorated_function
 
 
+def require_open_locrit(f):
+    """
+    Décorateur réservant une route de l'API v1 aux Locrits actifs et ouverts
+    aux autres Locrits ; leurs paramètres sont disponibles dans g.locrit_settings
+    """
+    @wraps(f)
+    def decorated_function(locrit_name, *args, **kwargs):
+        # Cas courant : une lecture de l'index des Locrits actifs, tenu à jour à l'écriture
+        settings = config_service.get_active_locrit_open_to(locrit_name, 'locrits')
+        if settings is None:
+            settings = config_service.get_locrit_settings(locrit_name)
+            if not settings:
+                return jsonify({'error': 'Locrit non trouvé'}), 404
+            if not settings.get('active', False):
+                return jsonify({'error': 'Locrit inactif'}), 400
+            return jsonify({'error': 'Locrit non accessible aux autres Locrits'}), 403
+
+        g.locrit_settings = settings
+        return f(locrit_name, *args, **kwargs)
+    return decorated_function
+
+
 @app.route('/')
 def index():
     """Page d'accueil - redirige vers le tableau de bord si connecté, sinon vers la connexion"""
@@ -391,17 +636,15 @@ def app_config():
 
 @app.route('/api/ollama/status', methods=['GET'])
 def ollama_status():
-    """Récupère le statut du serveur Ollama"""
+    """
+    Récupère le statut du serveur Ollama.
+    NOTE: Cette route est deprecated car chaque Locrit a son propre serveur Ollama.
+    """
     try:
-        from src.services.ollama_service import ollama_service
-
-        # Tester la connexion rapidement
-        result = ollama_service.test_connection()
-
         return jsonify({
-            'success': result.get('success', False),
-            'status': 'connected' if result.get('success') else 'disconnected',
-            'models_count': len(result.get('models', [])) if result.get('success') else 0
+            'success': False,
+            'status': 'deprecated',
+            'error': 'Cette route est deprecated. Chaque Locrit a son propre serveur Ollama configuré.'
         })
 
     except Exception as e:
@@ -413,11 +656,9 @@ def ollama_status():
 
 
 @app.route('/api/ollama/models', methods=['GET'])
-def ollama_models():
+async def ollama_models():
     """API pour récupérer la liste des modèles Ollama disponibles"""
     try:
-        import requests
-
         # Récupérer l'URL Ollama depuis la configuration
         ollama_url = config_service.get('ollama.base_url', 'http://localhost:11434')
         api_url = f"{ollama_url.rstrip('/')}/api/tags"
@@ -425,7 +666,8 @@ def ollama_models():
         logger.info(f"Récupération des modèles Ollama depuis: {api_url}")
 
         # Récupérer la liste des modèles
-        response = requests.get(api_url, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(api_url)
         response.raise_for_status()
 
         data = response.json()
@@ -447,7 +689,7 @@ def ollama_models():
             'total_models': len(models)
         })
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         logger.error(f"Erreur connexion Ollama pour récupérer modèles: {str(e)}")
         return jsonify({
             'success': False,
@@ -465,11 +707,9 @@ def ollama_models():
 
 
 @app.route('/config/test-ollama', methods=['POST'])
-def test_ollama_connection():
+async def test_ollama_connection():
     """Test la connexion au serveur Ollama côté serveur"""
     try:
-        import requests
-
         # Récupérer l'URL depuis le formulaire en priorité
         data = request.get_json() if request.is_json else {}
         test_url = data.get('ollama_url') or data.get('base_url')
@@ -489,7 +729,8 @@ def test_ollama_connection():
         logger.info(f"Test de connexion Ollama vers: {api_url}")
 
         # Test de connexion direct
-        response = requests.get(api_url, timeout=10)
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(api_url)
         response.raise_for_status()
 
         data = response.json()
@@ -503,7 +744,7 @@ def test_ollama_connection():
             'tested_url': test_url
         })
 
-    except requests.exceptions.ConnectionError as e:
+    except httpx.ConnectError as e:
         error_msg = f"Impossible de se connecter au serveur Ollama. Vérifiez que le serveur est démarré."
         logger.error(f"Erreur connexion Ollama: {error_msg} - {str(e)}")
         return jsonify({
@@ -513,7 +754,7 @@ def test_ollama_connection():
             'tested_url': test_url
         }), 500
 
-    except requests.exceptions.Timeout as e:
+    except httpx.TimeoutException as e:
         error_msg = f"Timeout lors de la connexion au serveur Ollama."
         logger.error(f"Timeout Ollama: {error_msg} - {str(e)}")
         return jsonify({
@@ -522,7 +763,7 @@ def test_ollama_connection():
             'tested_url': test_url
         }), 500
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         error_msg = f"Erreur de requête: {str(e)}"
         logger.error(f"Erreur requête Ollama: {error_msg}")
         return jsonify({
@@ -610,7 +851,7 @@ def api_chat_with_locrit(locrit_name):
     """API pour envoyer un message à un Locrit"""
     try:
         # Vérifier que le Locrit existe et est actif
-        settings = config_service.get_locrit_settings(locrit_name)
+        settings, base_prompt = config_service.get_locrit_base_prompt(locrit_name)
         if not settings:
             return jsonify({'error': 'Locrit non trouvé'}), 404
 
@@ -626,9 +867,11 @@ def api_chat_with_locrit(locrit_name):
         if not message:
             return jsonify({'error': 'Message vide'}), 400
 
-        # Utiliser le service Ollama pour générer la réponse
-        from src.services.ollama_service import get_ollama_service
-        ollama_service = get_ollama_service()
+        # Utiliser le service Ollama du Locrit pour générer la réponse
+        try:
+            ollama_service = _get_ollama_service(settings)
+        except ValueError as e:
+            return jsonify({'error': f'Service Ollama non disponible: {str(e)}'}), 503
 
         # Configurer le modèle du Locrit
         model = settings.get('ollama_model')
@@ -636,22 +879,17 @@ def api_chat_with_locrit(locrit_name):
             return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({'error': 'Service Ollama non disponible'}), 500
 
         # Préparer le prompt système basé sur la description du Locrit
-        system_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
+        system_prompt = base_prompt
 
         # Pour l'instant, utiliser une réponse synchrone simple
         # Le streaming sera ajouté dans la prochaine étape
         try:
-            import asyncio
-            ollama_service.current_model = model
-            ollama_service.is_connected = True
-            ollama_service.available_models = connection_test.get('models', [])
-
-            response = asyncio.run(ollama_service.chat(message, system_prompt))
+            response = _run_async(ollama_service.chat(message, system_prompt, model=model))
 
             return jsonify({
                 'success': True,
@@ -669,18 +907,13 @@ def api_chat_with_locrit(locrit_name):
         return jsonify({'error': str(e)}), 500
 
 
-from flask import Response
-import asyncio
-import json
-import threading
-
 @app.route('/api/locrits/<locrit_name>/chat/stream', methods=['POST'])
 @login_required
 def api_chat_stream_with_locrit(locrit_name):
     """API pour chat en streaming avec un Locrit"""
     try:
         # Vérifier que le Locrit existe et est actif
-        settings = config_service.get_locrit_settings(locrit_name)
+        settings, base_prompt = config_service.get_locrit_base_prompt(locrit_name)
         if not settings:
             return jsonify({'error': 'Locrit non trouvé'}), 404
 
@@ -696,9 +929,11 @@ def api_chat_stream_with_locrit(locrit_name):
         if not message:
             return jsonify({'error': 'Message vide'}), 400
 
-        # Utiliser le service Ollama pour générer la réponse
-        from src.services.ollama_service import get_ollama_service
-        ollama_service = get_ollama_service()
+        # Utiliser le service Ollama du Locrit pour générer la réponse
+        try:
+            ollama_service = _get_ollama_service(settings)
+        except ValueError as e:
+            return jsonify({'error': f'Service Ollama non disponible: {str(e)}'}), 503
 
         # Configurer le modèle du Locrit
         model = settings.get('ollama_model')
@@ -706,37 +941,30 @@ def api_chat_stream_with_locrit(locrit_name):
             return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
 
         # Test de connexion
-        connection_test = ollama_service.test_connection()
+        connection_test = ollama_service.test_connection(max_age=CONNECTION_CHECK_TTL)
         if not connection_test.get('success'):
             return jsonify({'error': 'Service Ollama non disponible'}), 500
 
         # Préparer le prompt système
-        system_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
+        system_prompt = base_prompt
 
         def generate_stream():
             """Générateur pour le streaming"""
             try:
-                # Utiliser le client Ollama synchrone avec streaming
-                import ollama
-
-                client = ollama.Client(host=ollama_service.base_url)
-
                 messages = []
                 if system_prompt:
                     messages.append({"role": "system", "content": system_prompt})
                 messages.append({"role": "user", "content": message})
 
-                stream = client.chat(
+                # Client asynchrone du service (connexions réutilisées) avec streaming
+                stream = _iter_chat_stream(
+                    ollama_service,
                     model=model,
-                    messages=messages,
-                    stream=True
+                    messages=messages
                 )
 
-                for chunk in stream:
-                    if 'message' in chunk and 'content' in chunk['message']:
-                        content = chunk['message']['content']
-                        if content:
-                            yield f"data: {json.dumps({'chunk': content, 'done': False})}\n\n"
+                for content in _stream_contents(stream):
+                    yield f"data: {json.dumps({'chunk': content, 'done': False})}\n\n"
 
                 yield f"data: {json.dumps({'done': True})}\n\n"
 
@@ -749,6 +977,7 @@ def api_chat_stream_with_locrit(locrit_name):
             mimetype='text/event-stream',
             headers={
                 'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
                 'Connection': 'keep-alive',
                 'Access-Control-Allow-Origin': '*'
             }
@@ -796,21 +1025,11 @@ def api_list_locrits():
 
 
 @app.route('/api/v1/locrits/<locrit_name>/info', methods=['GET'])
+@require_open_locrit
 def api_get_locrit_info(locrit_name):
     """API pour obtenir les informations d'un Locrit spécifique"""
     try:
-        settings = config_service.get_locrit_settings(locrit_name)
-        if not settings:
-            return jsonify({'error': 'Locrit non trouvé'}), 404
-
-        if not settings.get('active', False):
-            return jsonify({'error': 'Locrit inactif'}), 400
-
-        # Vérifier si le Locrit est ouvert aux autres Locrits
-        open_to_locrits = settings.get('open_to', {}).get('locrits', False)
-        if not open_to_locrits:
-            return jsonify({'error': 'Locrit non accessible aux autres Locrits'}), 403
-
+        settings = g.locrit_settings
         return jsonify({
             'success': True,
             'locrit': {
@@ -833,79 +1052,33 @@ def api_get_locrit_info(locrit_name):
 
 
 @app.route('/api/v1/locrits/<locrit_name>/chat', methods=['POST'])
+@require_open_locrit
 def api_v1_chat_with_locrit(locrit_name):
     """API publique pour chat avec un Locrit (pour communication inter-Locrits)"""
     try:
-        # Vérifier que le Locrit existe et est actif
-        settings = config_service.get_locrit_settings(locrit_name)
-        if not settings:
-            return jsonify({'error': 'Locrit non trouvé'}), 404
-
-        if not settings.get('active', False):
-            return jsonify({'error': 'Locrit inactif'}), 400
-
-        # Vérifier si le Locrit est ouvert aux autres Locrits
-        open_to_locrits = settings.get('open_to', {}).get('locrits', False)
-        if not open_to_locrits:
-            return jsonify({'error': 'Locrit non accessible aux autres Locrits'}), 403
-
-        # Récupérer le message et les métadonnées
-        data = request.get_json()
-        if not data or 'message' not in data:
-            return jsonify({'error': 'Message requis'}), 400
-
-        message = data['message'].strip()
-        if not message:
-            return jsonify({'error': 'Message vide'}), 400
-
-        # Métadonnées optionnelles pour le contexte
-        sender_name = data.get('sender_name', 'Locrit externe')
-        sender_type = data.get('sender_type', 'locrit')
-        context = data.get('context', '')
-
-        # Utiliser le service Ollama pour générer la réponse
-        from src.services.ollama_service import get_ollama_service
-        ollama_service = get_ollama_service()
-
-        # Configurer le modèle du Locrit
-        model = settings.get('ollama_model')
-        if not model:
-            return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
-
-        # Test de connexion
-        connection_test = ollama_service.test_connection()
-        if not connection_test.get('success'):
-            return jsonify({'error': 'Service Ollama non disponible'}), 500
-
-        # Préparer le prompt système enrichi avec le contexte
-        system_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
-        if sender_name and sender_type == 'locrit':
-            system_prompt += f"\n\nTu es en train de communiquer avec {sender_name}, un autre Locrit."
-        if context:
-            system_prompt += f"\n\nContexte de la conversation: {context}"
+        prep, error = _prepare_chat(locrit_name)
+        if error:
+            return error
+        ollama_service = prep.ollama_service
 
         try:
-            import asyncio
-            ollama_service.current_model = model
-            ollama_service.is_connected = True
-            ollama_service.available_models = connection_test.get('models', [])
-
-            response = asyncio.run(ollama_service.chat(message, system_prompt))
+            response = _run_async(ollama_service.chat(prep.message, prep.system_prompt, model=prep.model))
 
             # Log de la communication inter-Locrits
-            logger.info(f"Communication inter-Locrits: {sender_name} -> {locrit_name}")
+            logger.info(f"Communication inter-Locrits: {prep.sender_name} -> {locrit_name}")
 
             return jsonify({
                 'success': True,
                 'response': response,
                 'locrit_name': locrit_name,
-                'model': model,
-                'timestamp': datetime.now().isoformat(),
-                'sender_acknowledged': sender_name
+                'model': prep.model,
+                'timestamp': _iso_now(),
+                'sender_acknowledged': prep.sender_name
             })
 
         except Exception as e:
             logger.error(f"Erreur lors de la génération de la réponse: {str(e)}")
+            ollama_service.forget_connection_check()
             return jsonify({'error': f'Erreur de génération: {str(e)}'}), 500
 
     except Exception as e:
@@ -914,96 +1087,55 @@ def api_v1_chat_with_locrit(locrit_name):
 
 
 @app.route('/api/v1/locrits/<locrit_name>/chat/stream', methods=['POST'])
+@require_open_locrit
 def api_v1_chat_stream_with_locrit(locrit_name):
     """API publique pour chat en streaming avec un Locrit (pour communication inter-Locrits)"""
     try:
-        # Vérifier que le Locrit existe et est actif
-        settings = config_service.get_locrit_settings(locrit_name)
-        if not settings:
-            return jsonify({'error': 'Locrit non trouvé'}), 404
-
-        if not settings.get('active', False):
-            return jsonify({'error': 'Locrit inactif'}), 400
-
-        # Vérifier si le Locrit est ouvert aux autres Locrits
-        open_to_locrits = settings.get('open_to', {}).get('locrits', False)
-        if not open_to_locrits:
-            return jsonify({'error': 'Locrit non accessible aux autres Locrits'}), 403
-
-        # Récupérer le message et les métadonnées
-        data = request.get_json()
-        if not data or 'message' not in data:
-            return jsonify({'error': 'Message requis'}), 400
-
-        message = data['message'].strip()
-        if not message:
-            return jsonify({'error': 'Message vide'}), 400
-
-        # Métadonnées optionnelles
-        sender_name = data.get('sender_name', 'Locrit externe')
-        sender_type = data.get('sender_type', 'locrit')
-        context = data.get('context', '')
-
-        # Utiliser le service Ollama pour générer la réponse
-        from src.services.ollama_service import get_ollama_service
-        ollama_service = get_ollama_service()
-
-        # Configurer le modèle du Locrit
-        model = settings.get('ollama_model')
-        if not model:
-            return jsonify({'error': 'Aucun modèle configuré pour ce Locrit'}), 400
-
-        # Test de connexion
-        connection_test = ollama_service.test_connection()
-        if not connection_test.get('success'):
-            return jsonify({'error': 'Service Ollama non disponible'}), 500
-
-        # Préparer le prompt système enrichi
-        system_prompt = f"Tu es {locrit_name}, un Locrit. {settings.get('description', '')}"
-        if sender_name and sender_type == 'locrit':
-            system_prompt += f"\n\nTu es en train de communiquer avec {sender_name}, un autre Locrit."
-        if context:
-            system_prompt += f"\n\nContexte de la conversation: {context}"
+        prep, error = _prepare_chat(locrit_name)
+        if error:
+            return error
+        ollama_service = prep.ollama_service
 
         def generate_stream():
             """Générateur pour le streaming"""
             try:
                 # Log de la communication inter-Locrits
-                logger.info(f"Communication inter-Locrits (streaming): {sender_name} -> {locrit_name}")
-
-                # Utiliser le client Ollama synchrone avec streaming
-                import ollama
-
-                client = ollama.Client(host=ollama_service.base_url)
-
-                messages = []
-                if system_prompt:
-                    messages.append({"role": "system", "content": system_prompt})
-                messages.append({"role": "user", "content": message})
-
-                stream = client.chat(
-                    model=model,
-                    messages=messages,
-                    stream=True
+                logger.info(f"Communication inter-Locrits (streaming): {prep.sender_name} -> {locrit_name}")
+
+                messages = [
+                    {"role": "system", "content": prep.system_prompt},
+                    {"role": "user", "content": prep.message}
+                ]
+
+                # Client asynchrone du service (connexions réutilisées) avec streaming
+                stream = _iter_chat_stream(
+                    ollama_service,
+                    model=prep.model,
+                    messages=messages
                 )
 
-                for chunk in stream:
-                    if 'message' in chunk and 'content' in chunk['message']:
-                        content = chunk['message']['content']
-                        if content:
-                            yield f"data: {json.dumps({'chunk': content, 'done': False, 'locrit_name': locrit_name, 'timestamp': datetime.now().isoformat()})}\n\n"
+                # Partie fixe des trames, sérialisée une seule fois : seul le texte
+                # change d'un morceau à l'autre (l'horodatage est sur la trame finale).
+                # Les trames sont des bytes, que Werkzeug transmet sans les réencoder
+                prefix = b'data: {"locrit_name": ' + orjson.dumps(locrit_name) + b', "done": false, "chunk": '
+                suffix = b'}\n\n'
 
-                yield f"data: {json.dumps({'done': True, 'locrit_name': locrit_name, 'sender_acknowledged': sender_name})}\n\n"
+                for content in _stream_contents(stream):
+                    yield prefix + orjson.dumps(content) + suffix
+
+                yield b"data: " + orjson.dumps({'done': True, 'locrit_name': locrit_name, 'sender_acknowledged': prep.sender_name, 'timestamp': _iso_now()}) + b"\n\n"
 
             except Exception as e:
                 logger.error(f"Erreur lors du streaming: {str(e)}")
-                yield f"data: {json.dumps({'error': str(e), 'done': True})}\n\n"
+                ollama_service.forget_connection_check()
+                yield b"data: " + orjson.dumps({'error': str(e), 'done': True}) + b"\n\n"
 
         return Response(
             generate_stream(),
             mimetype='text/event-stream',
             headers={
                 'Cache-Control': 'no-cache',
+                'X-Accel-Buffering': 'no',
                 'Connection': 'keep-alive',
                 'Access-Control-Allow-Origin': '*'
             }
@@ -1014,16 +1146,25 @@ def api_v1_chat_stream_with_locrit(locrit_name):
         return jsonify({'error': str(e)}), 500
 
 
+# Corps de /api/v1/ping pour la seconde courante (horodatage, corps JSON)
+_ping_cache = ['', b'']
+
+
 # Endpoint pour tester la disponibilité de l'API
 @app.route('/api/v1/ping', methods=['GET'])
 def api_ping():
     """Endpoint de test pour vérifier que l'API est disponible"""
-    return jsonify({
-        'success': True,
-        'message': 'Locrit API v1 is running',
-        'timestamp': datetime.now().isoformat(),
-        'version': '1.0.0'
-    })
+    # Sondé fréquemment (health checks) : le corps n'est sérialisé qu'une fois par seconde
+    timestamp = _iso_now()
+    if timestamp != _ping_cache[0]:
+        _ping_cache[1] = orjson.dumps({
+            'success': True,
+            'message': 'Locrit API v1 is running',
+            'timestamp': timestamp,
+            'version': '1.0.0'
+        }, option=orjson.OPT_SORT_KEYS) + b"\n"
+        _ping_cache[0] = timestamp
+    return Response(_ping_cache[1], mimetype='application/json')
 
 
 @app.errorhandler(404)
@@ -1041,6 +1182,14 @@ def internal_error(error):
 
 
 if __name__ == '__main__':
+    # Le serveur Werkzeug sérialise les flux SSE : réservé au développement.
+    # En production :
+    #   gunicorn -c gunicorn_legacy.conf.py -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 web_app_old:app
+    if os.getenv('DEV_SERVER') != '1':
+        print("Serveur de développement désactivé : définir DEV_SERVER=1, ou lancer\n"
+              "  gunicorn -c gunicorn_legacy.conf.py -k gevent -w 4 --worker-connections 1000 -b 0.0.0.0:5000 web_app_old:app")
+        raise SystemExit(1)
+
     # Configuration pour le développement
     host = os.getenv('WEB_HOST', 'localhost')
     port = int(os.getenv('WEB_PORT', 5000))
@@ -1049,4 +1198,5 @@ if __name__ == '__main__':
     logger.info(f"Démarrage de l'interface web sur http://{host}:{port}")
     print(f"🌐 Interface web Locrit démarrée sur http://{host}:{port}")
 
-    app.run(host=host, port=port, debug=debug)
\ No newline at end of file
+    start_ollama_prewarm()
+    app.run(host=host, port=port, debug=debug)
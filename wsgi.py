@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Point d'entrée WSGI pour servir Locrit avec gunicorn et gevent
+
+    gunicorn -k gevent -w 1 --worker-connections 1000 -b 0.0.0.0:5000 wsgi:app
+
+Socket.IO garde l'état des clients dans le worker : au-delà d'un worker,
+il faut un répartiteur de charge avec sessions persistantes (sticky sessions).
+
+Les vues async (chat) ne tournent pas sur des greenlets : Flask exécute chaque
+vue async via asgiref (async_to_sync), dans une nouvelle boucle asyncio par
+requête. gevent ne rend coopératives que les E/S bloquantes des vues synchrones.
+"""
+
+# Doit précéder tout autre import pour que socket, ssl et threading soient
+# patchés avant que Flask, requests ou Ollama ne les utilisent
+from gevent import monkey
+monkey.patch_all()
+
+import os
+
+from backend.app import create_app
+
+app, socketio = create_app(os.getenv('FLASK_ENV', 'production'))